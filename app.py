@@ -9,10 +9,10 @@ from app_pages import page_ml_performance
 
 app = MultiPage(app_name= "UK Property Price Predictor")
 
-app.add_page("Project Summary", page_summary.page_summary_body)
-app.add_page("Property Analysis", page_property_analysis.page_property_analysis_body)
+app.add_page("Project Summary", page_summary.page_summary_body, static=True)
+app.add_page("Property Analysis", page_property_analysis.page_property_analysis_body, static=True)
 app.add_page("Price Predictor", page_price_predictor.page_price_predictor_body)
-app.add_page("Project Hypothesis", page_project_hypothesis.page_project_hypothesis_body)
+app.add_page("Project Hypothesis", page_project_hypothesis.page_project_hypothesis_body, static=True)
 app.add_page("ML Performance", page_ml_performance.page_ml_performance_body)
 
 app.run()
\ No newline at end of file
@@ -1,4 +1,5 @@
 import streamlit as st
+from src.static_reports import show_static_report
 
 #creates a multi-page Streamlit app
 class MultiPage:
@@ -11,11 +12,12 @@ class MultiPage:
             page_icon="🏠"
         )
 
-    # add pages to the app
-    def add_page(self, title, func):
+    # add pages to the app (static pages can be served from a pre-rendered report)
+    def add_page(self, title, func, static=False):
         self.pages.append({
             "title": title,
-            "function": func
+            "function": func,
+            "static": static
         })
 
     # Run the app
@@ -27,5 +29,8 @@ class MultiPage:
             self.pages,
             format_func=lambda page: page['title']
         )
-    
+
+        # Read-only pages come from src/static_reports.py when a report exists for this data
+        if page['static'] and show_static_report(page['title']):
+            return
         page['function']()
\ No newline at end of file
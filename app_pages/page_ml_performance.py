@@ -1,15 +1,19 @@
+import hashlib
+import pickle
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import KFold, train_test_split, cross_val_score
 from sklearn.metrics import mean_absolute_error, r2_score
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.neighbors import KNeighborsRegressor
 import plotly.express as px
 import plotly.graph_objects as go
-from src.data_manager import load_small_dataset
+from src.data_manager import load_small_dataset, load_feature_matrix
+from src.feature_engineering import CATEGORICAL_COLUMNS, FEATURES
+from src.model_registry import build_models, build_interval_models, model_columns, INTERVAL_QUANTILES
+from src.tree_attribution import cell_attributions
+
+# Test properties offered in the explanation dropdown
+ATTRIBUTION_CHOICES = 200
 
 def page_ml_performance_body():
     st.write("### ML Model Performance Metrics")
@@ -23,48 +27,27 @@ def page_ml_performance_body():
         st.write("#### 1. Data Preparation")
         original_count = len(df)
         
-        # Remove very cheap and very expensive houses
-        df_clean = df[(df['Price'] > 50000) & (df['Price'] < 1000000)].copy()
-        removed = original_count - len(df_clean)
+        # Remove very cheap and very expensive houses and encode the features straight into
+        # one float32 matrix, built once per dataset (see build_feature_matrix)
+        matrix = load_feature_matrix()
+        X = matrix['X']  # Features (what we know)
+        y = matrix['y']  # Target (what we want to predict)
+        removed = original_count - len(y)
         
         # Show how many properties we're using
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric("Original Data", f"{original_count:,} properties")
         with col2:
-            st.metric("After Cleaning", f"{len(df_clean):,} properties")
+            st.metric("After Cleaning", f"{len(y):,} properties")
         with col3:
             st.metric("Outliers Removed", f"{removed:,} properties")
         
         # Step 2: Create new features from existing data
         st.write("#### 2. Feature Engineering")
         
-        df_encoded = df_clean.copy()
-        
-        # Convert text to numbers so computer can understand
-        df_encoded['Property_Type_Encoded'] = pd.Categorical(df_clean['Property Type']).codes
-        df_encoded['County_Encoded'] = pd.Categorical(df_clean['County']).codes
-        df_encoded['Old_New_Encoded'] = pd.Categorical(df_clean['Old/New']).codes
-        df_encoded['Duration_Encoded'] = pd.Categorical(df_clean['Duration']).codes
-        
         st.write("**Creating new features to help prediction...**")
         
-        # Combine property type and age (new terraced vs old terraced might differ)
-        df_encoded['Type_Age_Interaction'] = (
-            df_encoded['Property_Type_Encoded'] * df_encoded['Old_New_Encoded']
-        )
-        
-        # Group counties by how expensive they are
-        county_avg_price = df_clean.groupby('County')['Price'].mean()
-        df_encoded['County_Price_Tier'] = df_clean['County'].map(
-            lambda x: 0 if county_avg_price[x] < 250000 else 
-                     (1 if county_avg_price[x] < 400000 else 2)
-        )
-        
-        # How common is each property type (rare types might cost more)
-        type_frequency = df_clean['Property Type'].value_counts(normalize=True)
-        df_encoded['Type_Rarity'] = df_clean['Property Type'].map(type_frequency)
-        
         # Show what features we created
         feature_types = {
             'Original Features': ['Property Type', 'County', 'Old/New', 'Duration'],
@@ -84,29 +67,24 @@ def page_ml_performance_body():
             st.metric("Total Features", "7", delta="+3 new features")
         
         # List all features we'll use
-        features = [
-            'Property_Type_Encoded', 'County_Encoded', 'Old_New_Encoded', 
-            'Duration_Encoded', 'Type_Age_Interaction', 'County_Price_Tier', 
-            'Type_Rarity'
-        ]
-        X = df_encoded[features]  # Features (what we know)
-        y = df_encoded['Price']   # Target (what we want to predict)
-        
-        # Split data - 80% for training, 20% for testing
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
+        features = FEATURES
+        
+        # Split row numbers rather than the data - 80% for training, 20% for testing
+        train_idx, test_idx = train_test_split(
+            np.arange(len(y)), test_size=0.2, random_state=42
         )
+        X_train, X_test = X[train_idx], X[test_idx]
+        y_train, y_test = y[train_idx], y[test_idx]
+        
+        # Cross-validation folds as row numbers into the full matrix (same folds as cv=5 on the training rows)
+        cv_folds = [(train_idx[fit_rows], train_idx[check_rows])
+                    for fit_rows, check_rows in KFold(n_splits=5).split(train_idx)]
         
         # Step 3: Try different models to see which works best
         st.write("#### 3. Model Comparison")
         
-        # Create 4 different models to test
-        models = {
-            'Linear Regression': LinearRegression(),  # Simplest model
-            'Decision Tree': DecisionTreeRegressor(max_depth=10, random_state=42),  # Tree-based
-            'Random Forest': RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42),  # Many trees
-            'K-Nearest Neighbors': KNeighborsRegressor(n_neighbors=10)  # Looks at similar properties
-        }
+        # Create the different models to test (see src/model_registry.py)
+        models = build_models()
         
         # Show progress while training
         progress_bar = st.progress(0)
@@ -122,12 +100,17 @@ def page_ml_performance_body():
             status_text.text(f'Training {name}...')
             progress_bar.progress((i + 1) / len(models))
             
+            # Gradient boosting reads the raw category codes, the others use every feature
+            columns = model_columns(name)
+            model_X_train = X_train[:, columns]
+            model_X_test = X_test[:, columns]
+            
             # Train the model on training data
-            model.fit(X_train, y_train)
+            model.fit(model_X_train, y_train)
             
             # Make predictions
-            train_pred = model.predict(X_train)
-            test_pred = model.predict(X_test)
+            train_pred = model.predict(model_X_train)
+            test_pred = model.predict(model_X_test)
             
             # Check how good predictions are
             train_r2 = r2_score(y_train, train_pred)
@@ -135,7 +118,7 @@ def page_ml_performance_body():
             test_mae = mean_absolute_error(y_test, test_pred)
             
             # Test model 5 times to make sure it's stable
-            cv_scores = cross_val_score(model, X_train, y_train, cv=5, 
+            cv_scores = cross_val_score(model, X[:, columns], y, cv=cv_folds, 
                                        scoring='r2', n_jobs=-1)
             
             # Save all results
@@ -253,6 +236,35 @@ def page_ml_performance_body():
             fig = px.bar(importance_df, x='Importance', y='Feature', orientation='h',
                         title='Feature Importance for Price Prediction')
             st.plotly_chart(fig, use_container_width=True)
+
+        # Per-property explanations from a tree model (the best one if it is a tree)
+        explain_name = best_model if best_model in ['Random Forest', 'Decision Tree'] else 'Random Forest'
+        st.write(f"**Why Did This Property Get Its Price? ({explain_name})**")
+
+        # Only the properties offered in the dropdown are explained (see src/tree_attribution.py)
+        explain_model = model_results[explain_name]['model']
+        attributions, expected_value = explain_properties(explain_model, model_key(explain_model),
+                                                          X_test[:ATTRIBUTION_CHOICES])
+        shown_rows = matrix['rows'][test_idx[:ATTRIBUTION_CHOICES]]
+        properties = df.iloc[shown_rows][list(CATEGORICAL_COLUMNS)].reset_index(drop=True)
+        attribution_panel(explain_name, properties, attributions, expected_value,
+                          model_results[explain_name]['predictions'])
+
+        # Price range from quantile gradient boosting (a low and a high estimate per property)
+        st.write("**Prediction Range (Gradient Boosting):**")
+        low_q, high_q = INTERVAL_QUANTILES
+        interval_models = build_interval_models()
+        interval_X_train = X_train[:, model_columns('Gradient Boosting')]
+        interval_X_test = X_test[:, model_columns('Gradient Boosting')]
+        low_pred = interval_models[low_q].fit(interval_X_train, y_train).predict(interval_X_test)
+        high_pred = interval_models[high_q].fit(interval_X_train, y_train).predict(interval_X_test)
+        coverage = ((y_test >= low_pred) & (y_test <= high_pred)).mean()
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(f"Sales Inside {high_q - low_q:.0%} Range", f"{coverage:.1%}")
+        with col2:
+            st.metric("Average Range Width", f"£{(high_pred - low_pred).mean():,.0f}")
         
         # Step 5: Explain what the results mean
         st.write("#### 5. What Do These Results Mean?")
@@ -295,4 +307,38 @@ def page_ml_performance_body():
             """)
     
     else:
-        st.error("Could not load data for ML performance analysis")
\ No newline at end of file
+        st.error("Could not load data for ML performance analysis")
+
+
+# Fingerprint of a fitted model. Training is seeded, so retraining on the same data
+# (every visit to the page) gives the same model and the same key.
+def model_key(model):
+    return hashlib.sha256(pickle.dumps(model)).hexdigest()
+
+
+# Attributions for the dropdown's properties, cached per fitted model
+@st.cache_data(show_spinner="Explaining predictions...", max_entries=4)
+def explain_properties(_model, key, X):
+    return cell_attributions(_model, X)
+
+
+# Picking another property only reruns this part, not the model training above
+@st.fragment
+def attribution_panel(model_name, properties, attributions, expected_value, predictions):
+    labels = [
+        f"#{i + 1}: {row['Property Type']} / {row['County']} / {row['Old/New']} / {row['Duration']}"
+        for i, row in properties.head(ATTRIBUTION_CHOICES).iterrows()
+    ]
+    choice = st.selectbox("Test property", range(len(labels)), format_func=lambda i: labels[i])
+
+    contribution_df = pd.DataFrame({
+        'Feature': FEATURES,
+        'Contribution': attributions[choice]
+    }).sort_values('Contribution')
+
+    fig = px.bar(contribution_df, x='Contribution', y='Feature', orientation='h',
+                title=f'Average price £{expected_value:,.0f} → predicted £{predictions[choice]:,.0f}')
+    fig.update_layout(xaxis_tickformat='£,.0f')
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Bars show how much each feature moved the {model_name} prediction "
+               "away from the average price. Together they add up to the prediction.")
\ No newline at end of file
@@ -1,115 +1,193 @@
 import streamlit as st
 import pandas as pd 
-from src.data_manager import load_small_dataset
+from src.data_manager import load_predictor_options, load_price_cube, load_geo_index, load_comparables_index
+from src.comparables import SORT_OPTIONS
+
+# Number of comparable sales shown per page
+COMPARABLES_PAGE_SIZE = 20
+
+DURATION_NAMES = {'F': 'Freehold', 'L': 'Leasehold'}
 
 # Display price prediction page
 def page_price_predictor_body():
     st.write("### Property Price Predictor")
     st.write("---")
     
-    # Load property data
-    df = load_small_dataset()
-    if df is not None: 
+    # Dropdown options are precomputed once, not read from the data on every rerun
+    options = load_predictor_options()
+    if options is not None: 
         st.write("#### Enter Property Details")
         st.info("Fill in the property characteristics below to get a price prediction based on similar UK properties")
 
+        prediction_panel(options)
+
+        # Information box about tenure types 
+        st.info("""
+        **Tenure Types Explained:**
+        - **Freehold**: You own the property and land permanently (typical for houses).
+        - **Leasehold**: You own the property for a fixed period, usually 99-999 years.
+        """)
+
+        st.write("#### How this works")
+        st.write("""
+        This predictor analyzes similar properties in our database and calculates the average price. 
+        The prediction accuracy depends on:
+        - Number of similar properties found
+        - How closely they match your criteria
+        - Regional market conditions
+        
+        **Note:** This is an estimate based on historical data and should not be used as the sole basis for property decisions.
+        
+        """)   
+    else:
+        st.error("Error loading data for predictions")
+
+
+# The inputs and results rerun on their own - the rest of the page isn't redrawn.
+# Inputs sit in a form, so changing a dropdown does nothing until "Predict Price" is pressed.
+@st.fragment
+def prediction_panel(options):
+    with st.form("predictor_form", border=False):
         col1, col2 = st.columns(2)
 
         # Left column - property type and location
         with col1:
-            property_type = st.selectbox("Property Type", options=df['Property Type'].unique(),
+            property_type = st.selectbox("Property Type", options=options['property_types'],
                                         help="D=Detached, S=Semi-detached, T=Terraced, F=Flat")
-            county = st.selectbox("County", options=sorted(df['County'].unique()),
+            county = st.selectbox("County", options=options['counties'],
                                 help="Select the county where your property is located")
         
         # Right column - property age and ownership type
         with col2:
             # User selects if property is newly built or older
             old_new = st.selectbox("Old/New Property", 
-                                   options=df['Old/New'].unique(),
+                                   options=options['old_new'],
                                    format_func=lambda x: "New Build" if x == "Y" else "Existing Property",
                                    help="Y=New Build, N=Existing Property")
 
             # User selects property tenure (ownership type)
-            duration_mapping = {'F': 'Freehold', 'L': 'Leasehold'}
-            duraration_options = [duration_mapping.get(d,d) for d in df['Duration'].unique()]
+            duration = st.selectbox("Property Tenure",
+                                    options=options['durations'],
+                                    format_func=lambda d: DURATION_NAMES.get(d, d),
+                                    help="Freehold: Own property & land permanently. Leashold: Own for fixed period")
 
-            duration_display = st.selectbox("Property Tenure",
-                                            options=duraration_options,
-                                            help="Freehold: Own property & land permanently. Leashold: Own for fixed period")
+        # When user clicks the predict button
+        if st.form_submit_button("Predict Price", type="primary"):
+            # Remember the search so the results survive paging through comparables
+            st.session_state['prediction_cell'] = (property_type, county, old_new, duration)
+            st.session_state['comparables_cursors'] = [0]
 
-            duration = 'F' if duration_display == 'Freehold' else 'L'
+    if st.session_state.get('prediction_cell') is not None:
+        show_prediction(st.session_state['prediction_cell'])
 
-        # Information box about tenure types 
-        st.info("""
-        **Tenure Types Explained:**
-        - **Freehold**: You own the property and land permanently (typical for houses).
-        - **Leasehold**: You own the property for a fixed period, usually 99-999 years.
-        """)
 
-        # When user clicks the predict button
-        if st.button("Predict Price", type="primary"):
-            # Find properties that match the user's criteria
-            similar_properties = df[
-                (df['Property Type'] == property_type) &
-                (df['County'] == county) &
-                (df['Old/New'] == old_new) &
-                (df['Duration'] == duration)
-            ]['Price']
-
-            # If we found matching properties
-            if len(similar_properties) > 0:
-                # Calculate the average price of similar properties
-                prediction = similar_properties.mean()
-
-                st.success(f"Predicted Price: £{prediction:,.0f}")
-                
-                # Shows additional information about similar properties
-                st.write("#### Similar Property Analysis")
-
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Properties Found",len(similar_properties))
-                with col2:
-                    st.metric(f"Median price", f"£{similar_properties.median():,.0f}")
-                with col3:                   
-                    st.metric(f"Price range", f"£{similar_properties.min():,.0f} - £{similar_properties.max():,.0f}")
-                
-                st.write(f"**Price Range:** £{similar_properties.min():,.0f} - £{similar_properties.max():,.0f}")
-
-                if len(similar_properties) > 50:
-                    st.success("High confidence prediction (50+ similar properties)")
-                elif len(similar_properties) >= 20:
-                    st.warning("Medium confidence prediction (20+ simila properties)")
-                else:
-                    st.warning("Lower confidence prediction (fewer than 20 similar properties)")
-
-            else:
-                # if no exact matches, show fallback option
-                st.warning(f"No properties found with exact matching criteria")
-
-                fallback_properties = df[
-                    (df['Property Type'] == property_type) &
-                    (df['County'] == county)
-                ]['Price']
-
-                if len(fallback_properties) > 0:
-                    fallback_avg = fallback_properties.mean()
-                    st.info(f"** Alternative estimate based on {len(fallback_properties)} similar properties in {county}:** £{fallback_avg:,.0f}")
-                else:
-                    county_avg = df[df['County'] == county]['Price'].mean()
-                    st.info(f"County average for {county}:** £{county_avg:,.0f}")
+# Prediction for one (type, county, old/new, tenure) cell - a dictionary lookup, no scans
+def show_prediction(cell):
+    property_type, county, old_new, duration = cell
+    cube = load_price_cube()
+    similar = cube['cell'].get(cell)
 
-        st.write("#### How this works")
-        st.write("""
-        This predictor analyzes similar properties in our database and calculates the average price. 
-        The prediction accuracy depends on:
-        - Number of similar properties found
-        - How closely they match your criteria
-        - Regional market conditions
+    # If we found matching properties
+    if similar is not None:
+        # The prediction is the average price of similar properties
+        st.success(f"Predicted Price: £{similar['mean']:,.0f}")
         
-        **Note:** This is an estimate based on historical data and should not be used as the sole basis for property decisions.
+        # Shows additional information about similar properties
+        st.write("#### Similar Property Analysis")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Properties Found", similar['count'])
+        with col2:
+            st.metric(f"Median price", f"£{similar['median']:,.0f}")
+        with col3:                   
+            st.metric(f"Price range", f"£{similar['min']:,.0f} - £{similar['max']:,.0f}")
         
-        """)   
+        st.write(f"**Price Range:** £{similar['min']:,.0f} - £{similar['max']:,.0f}")
+
+        if similar['count'] > 50:
+            st.success("High confidence prediction (50+ similar properties)")
+        elif similar['count'] >= 20:
+            st.warning("Medium confidence prediction (20+ simila properties)")
+        else:
+            st.warning("Lower confidence prediction (fewer than 20 similar properties)")
+
     else:
-        st.error("Error loading data for predictions")
\ No newline at end of file
+        # if no exact matches, show fallback option
+        st.warning(f"No properties found with exact matching criteria")
+
+        fallback = cube['type_county'].get((property_type, county))
+        if fallback is not None:
+            st.info(f"** Alternative estimate based on {fallback['count']} similar properties in {county}:** £{fallback['mean']:,.0f}")
+        else:
+            st.info(f"County average for {county}:** £{cube['county'][county]['mean']:,.0f}")
+
+    # Optional finer location - the geography index knows which districts and towns exist
+    geo_index = load_geo_index()
+    col1, col2 = st.columns(2)
+    with col1:
+        district = st.selectbox("District (optional)",
+                                options=[None] + geo_index.districts(county),
+                                format_func=lambda x: "Any district" if x is None else x,
+                                help="Narrow the estimate down to a local authority district")
+    with col2:
+        town = st.selectbox("Town/City (optional)",
+                            options=[None] + (geo_index.towns(county, district) if district else []),
+                            format_func=lambda x: "Any town" if x is None else x,
+                            disabled=district is None,
+                            help="Narrow the estimate down to a town within the district")
+
+    # Local estimate from the geography index (blends small areas with their county)
+    if district is not None:
+        local = geo_index.estimate(property_type, duration, county, district, town)
+        if local['estimate'] is not None:
+            st.info(f"**Local estimate ({local['level']} level, {local['count']} sales):** £{local['estimate']:,.0f}")
+
+    # Let the user browse the actual sales behind the prediction
+    show_comparables(cell)
+
+
+# Go back to the first page whenever the filters or sort order change
+def _reset_comparables_page():
+    st.session_state['comparables_cursors'] = [0]
+
+
+# Paged table of matching sales, served from the date-sorted comparables index
+def show_comparables(cell):
+    index = load_comparables_index()
+    first_date, last_date = index.date_bounds(cell)
+    if first_date is None:
+        return
+
+    with st.expander(f"📋 Show comparable sales ({index.count(cell):,} matching properties)"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            start_date = st.date_input("From", value=first_date.date(), min_value=first_date.date(),
+                                       max_value=last_date.date(), on_change=_reset_comparables_page)
+        with col2:
+            end_date = st.date_input("To", value=last_date.date(), min_value=first_date.date(),
+                                     max_value=last_date.date(), on_change=_reset_comparables_page)
+        with col3:
+            sort = st.selectbox("Sort by", options=SORT_OPTIONS, on_change=_reset_comparables_page)
+
+        # Stack of cursors, one per page visited, so "Previous" can step back
+        cursors = st.session_state.setdefault('comparables_cursors', [0])
+        end_of_day = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(1)
+        rows, next_cursor = index.page(cell, start_date, end_of_day, sort=sort,
+                                       cursor=cursors[-1], page_size=COMPARABLES_PAGE_SIZE)
+
+        total = index.count(cell, start_date, end_of_day)
+        if total == 0:
+            st.info("No comparable sales in this period")
+            return
+
+        st.write(f"Showing {cursors[-1] + 1:,} - {cursors[-1] + len(rows):,} of {total:,} sales")
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("Previous", disabled=len(cursors) == 1,
+                      on_click=lambda: cursors.pop())
+        with col2:
+            st.button("Next", disabled=next_cursor is None,
+                      on_click=lambda: cursors.append(next_cursor))
@@ -1,18 +1,19 @@
 import streamlit as st
 import pandas as pd 
 import plotly.express as px
-from src.data_manager import load_small_dataset
+from src.data_manager import load_period, period_selector
 
 # Display project hypothesis page
 def page_project_hypothesis_body():
     st.write("### Project Hypothesis Validation")
     st.write("---")
 
-    # Load the property data 
-    df = load_small_dataset()
+    # Load the property data for the years picked in the sidebar
+    start_year, end_year = period_selector()
+    df = load_period(start_year, end_year) if start_year is not None else None
     if df is not None:
 
-        st.info("**Data Period:** Analysis based on UK property transactions 1995-2017")
+        st.info(f"**Data Period:** Analysis based on UK property transactions {start_year}-{end_year}")
 
         # Hypothesis 1: Revised based on data reality
         st.write("#### Hypothesis 1: Home Counties Command Premium Prices")
@@ -3,17 +3,18 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
-from src.data_manager import load_small_dataset
+from src.data_manager import load_period, period_selector
 
 # Display property analysis page
 def page_property_analysis_body():
     st.write("### Property Data Analysis")
     st.write("---")
 
-    # Load small dataset
-    df = load_small_dataset()
+    # Load the sales for the years picked in the sidebar
+    start_year, end_year = period_selector()
+    df = load_period(start_year, end_year) if start_year is not None else None
     if df is not None:
-        st.info(f"Analyzing {len(df):,} properties from UK housing market")
+        st.info(f"Analyzing {len(df):,} properties from UK housing market ({start_year}-{end_year})")
 
         # Chart 1: Show how many of each property type we have
         st.write("#### Property Type Distribution")
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from src.data_manager import load_small_dataset
+from src.data_manager import load_period, period_selector
 
 # Display project summary page
 def page_summary_body():
@@ -23,7 +23,8 @@ def page_summary_body():
     # Dataset summary with real data
     st.write("#### Dataset Summary")
 
-    df = load_small_dataset()
+    start_year, end_year = period_selector()
+    df = load_period(start_year, end_year) if start_year is not None else None
     if df is not None:
         col1, col2 = st.columns(2)
 
@@ -32,7 +33,7 @@ def page_summary_body():
             st.metric("Average Price", f"£{df['Price'].mean():,.0f}")
         
         with col2:
-            st.metric("Date Range", f"{df['Date of Transfer'].min()[:4]} - {df['Date of Transfer'].max()[:4]}")
+            st.metric("Date Range", f"{df['Date of Transfer'].min().year} - {df['Date of Transfer'].max().year}")
             st.metric("Property Types", df['Property Type'].nunique())
         
     else:
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+
+from src.feature_engineering import clean_prices, engineer_features
+from src.model_registry import build_models, model_features
+from src.zip_reader import RAW_ZIP
+
+RAW_COLUMNS = ['Price', 'Property Type', 'Old/New', 'Duration', 'County']
+
+# Sample sizes to compare at (None = every row in the file)
+DEFAULT_SIZES = [20000, 2000000, None]
+
+# Throughput is measured on at most this many test rows so KNN doesn't take hours
+MAX_PREDICT_ROWS = 100000
+
+
+# Train and score one model, timing training and prediction separately
+def benchmark_model(name, model, X_train, X_test, y_train, y_test):
+    columns = model_features(name)
+    model_X_train = X_train[columns]
+    model_X_test = X_test[columns].iloc[:MAX_PREDICT_ROWS]
+    model_y_test = y_test.iloc[:MAX_PREDICT_ROWS]
+
+    start = time.perf_counter()
+    model.fit(model_X_train, y_train)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = model.predict(model_X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'train_seconds': train_seconds,
+        'predict_rows_per_sec': len(model_X_test) / predict_seconds,
+        'test_r2': r2_score(model_y_test, predictions),
+        'test_mae': mean_absolute_error(model_y_test, predictions),
+    }
+
+
+def run_benchmark(df, sizes=DEFAULT_SIZES, model_names=None):
+    results = []
+    for size in sizes:
+        sample = df if size is None or size >= len(df) else df.sample(n=size, random_state=42)
+        df_encoded = engineer_features(clean_prices(sample))
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            df_encoded, df_encoded['Price'], test_size=0.2, random_state=42
+        )
+
+        for name, model in build_models(model_names).items():
+            print(f"{len(sample):>10,} rows - training {name}...")
+            scores = benchmark_model(name, model, X_train, X_test, y_train, y_test)
+            results.append({'rows': len(sample), 'model': name, **scores})
+
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare training time, speed and accuracy of every model")
+    parser.add_argument("--csv", default=RAW_ZIP, help="Land Registry CSV (or the Kaggle zip) to sample from")
+    parser.add_argument("--sizes", nargs="+", default=["20000", "2000000", "full"],
+                        help="Row counts to test, 'full' for the whole file")
+    parser.add_argument("--models", nargs="+", help="Only benchmark these models")
+    parser.add_argument("--output", default="outputs/models/benchmark_results.json")
+    args = parser.parse_args()
+
+    sizes = [None if size == "full" else int(size) for size in args.sizes]
+    df = pd.read_csv(args.csv, usecols=RAW_COLUMNS)
+    print(f"Loaded {len(df):,} properties from {args.csv}")
+
+    results = run_benchmark(df, sizes, args.models)
+    print(results.to_string(index=False))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results.to_dict(orient='records'), f, indent=4)
+    print(f"Benchmark results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# A comparable sale matches on all four of these
+CELL_COLUMNS = ['Property Type', 'County', 'Old/New', 'Duration']
+
+# Columns shown in the comparable sales table
+DISPLAY_COLUMNS = ['Date of Transfer', 'Price', 'Town/City', 'District', 'County',
+                   'Property Type', 'Old/New', 'Duration']
+
+SORT_OPTIONS = ['Newest first', 'Oldest first', 'Highest price', 'Lowest price']
+
+# Price orders of date ranges narrower than a cell that are kept for paging (shared by all sessions)
+PRICE_SORT_CACHE = 64
+
+
+# Every (type, county, old/new, tenure) cell keeps its row ids sorted by date in one
+# shared array, so a date range is two binary searches and a page is a slice.
+class ComparablesIndex:
+    def __init__(self, df, row_ids, dates, prices, price_order, cells):
+        self.df = df
+        self.row_ids = row_ids          # row positions, grouped by cell and sorted by date
+        self.dates = dates              # transfer dates in the same order (int64 nanoseconds)
+        self.prices = prices            # prices in the same order
+        self.price_order = price_order  # row positions, grouped by cell and sorted by price
+        self.cells = cells              # cell key -> (start, end) in the arrays above
+        self._range_price_order = lru_cache(maxsize=PRICE_SORT_CACHE)(self._sort_range_by_price)
+
+    # First and last sale date in a cell
+    def date_bounds(self, cell):
+        start, end = self.cells.get(cell, (0, 0))
+        if start == end:
+            return None, None
+        return pd.Timestamp(self.dates[start]), pd.Timestamp(self.dates[end - 1])
+
+    def count(self, cell, start_date=None, end_date=None):
+        start, end = self._date_range(cell, start_date, end_date)
+        return end - start
+
+    # Return one page of comparables and the cursor for the next page (None on the last page).
+    # Every sort works within the date range. A page costs two binary searches plus a slice,
+    # except the first price-sorted page of a date range narrower than the cell: that sorts
+    # the k sales in the range (O(k log k)) once, and later pages reuse the cached order.
+    def page(self, cell, start_date=None, end_date=None, sort='Newest first', cursor=0, page_size=20):
+        start, end = self._date_range(cell, start_date, end_date)
+        ids = self.row_ids[start:end]
+        if sort in ('Highest price', 'Lowest price'):
+            if (start, end) == self.cells.get(cell):
+                ids = self.price_order[start:end]  # the whole cell is already sorted by price
+            else:
+                ids = self._range_price_order(start, end)
+
+        if sort in ('Newest first', 'Highest price'):
+            # Walk the range backwards from its end
+            stop = len(ids) - cursor
+            rows = ids[max(stop - page_size, 0):stop][::-1]
+        else:
+            rows = ids[cursor:cursor + page_size]
+
+        next_cursor = cursor + len(rows)
+        if next_cursor >= len(ids):
+            next_cursor = None
+        return self.df.iloc[rows], next_cursor
+
+    # Row ids of part of a cell's date range, sorted by price (cached by _range_price_order)
+    def _sort_range_by_price(self, start, end):
+        ids = self.row_ids[start:end]
+        return ids[np.argsort(self.prices[start:end], kind='stable')]
+
+    # Binary search the cell's dates for the requested range
+    def _date_range(self, cell, start_date=None, end_date=None):
+        start, end = self.cells.get(cell, (0, 0))
+        dates = self.dates[start:end]
+        low = 0 if start_date is None else np.searchsorted(dates, _to_int(start_date), side='left')
+        high = len(dates) if end_date is None else np.searchsorted(dates, _to_int(end_date), side='right')
+        # A "to" date before the "from" date is an empty range, not a negative one
+        high = max(high, low)
+        return start + low, start + high
+
+
+def _to_int(date):
+    return pd.Timestamp(date).value
+
+
+# Sort once by cell then date (and cell then price) and record where each cell starts and ends
+def build_comparables_index(df):
+    table = df[DISPLAY_COLUMNS].reset_index(drop=True)
+    dates = pd.to_datetime(table['Date of Transfer']).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    cell_codes, cell_keys = pd.MultiIndex.from_frame(table[CELL_COLUMNS]).factorize()
+
+    row_ids = np.lexsort((dates, cell_codes))
+    price_order = np.lexsort((table['Price'].to_numpy(), cell_codes))
+
+    # Cells are contiguous in both orders, so one set of boundaries works for both
+    sorted_codes = cell_codes[row_ids]
+    starts = np.searchsorted(sorted_codes, np.arange(len(cell_keys)), side='left')
+    ends = np.searchsorted(sorted_codes, np.arange(len(cell_keys)), side='right')
+    cells = dict(zip(cell_keys, zip(starts.tolist(), ends.tolist())))
+
+    return ComparablesIndex(table, row_ids, dates[row_ids], table['Price'].to_numpy()[row_ids], price_order, cells)
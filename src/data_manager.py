@@ -1,12 +1,128 @@
 import streamlit as st 
 import pandas as pd 
+from src.geo_index import build_geo_index
+from src.comparables import build_comparables_index
+from src.partitions import PARTITION_DIR, file_sha256, load_stats, read_date_range
+from src.feature_engineering import build_feature_matrix
+
+# Where the app's data lives (the memory profiler points these at test data)
+SMALL_DATASET_PATH = "inputs/datasets/collection/uk_housing_small.csv"
+PERIOD_PARTITION_DIR = PARTITION_DIR
 
 # Load the pre-processed small dataset for fast performance
 @st.cache_data
 def load_small_dataset():
     try:
-        df = pd.read_csv("inputs/datasets/collection/uk_housing_small.csv")
+        df = pd.read_csv(SMALL_DATASET_PATH, parse_dates=['Date of Transfer'])
         return df
     except FileNotFoundError:
         st.error("Small dataset not found - please create it first")
         return None
+
+
+# Build the geography price index once and share it between all sessions
+@st.cache_resource
+def load_geo_index():
+    df = load_small_dataset()
+    if df is None:
+        return None
+    return build_geo_index(df)
+
+
+# Date-sorted comparable sales for every property cell, shared between sessions
+@st.cache_resource
+def load_comparables_index():
+    df = load_small_dataset()
+    if df is None:
+        return None
+    return build_comparables_index(df)
+
+
+# Float32 feature matrix, prices and kept row positions for model training, built once per
+# dataset and shared (cache_resource hands out the same arrays instead of copies - don't modify them)
+@st.cache_resource
+def load_feature_matrix():
+    df = load_small_dataset()
+    if df is None:
+        return None
+    X, y, rows = build_feature_matrix(df)
+    return {'X': X, 'y': y, 'rows': rows}
+
+
+# Partition stats, but only if the partitions were built from the current small dataset
+def _partition_stats():
+    try:
+        source_hash = file_sha256(SMALL_DATASET_PATH)
+    except FileNotFoundError:
+        source_hash = None  # nothing to compare against - use the partitions as they are
+    return load_stats(PERIOD_PARTITION_DIR, source_hash)
+
+
+# Years we have data for - read from the partition stats when they exist
+@st.cache_data
+def load_available_years():
+    stats = _partition_stats()
+    if stats is not None:
+        return [int(year) for year in stats]
+    df = load_small_dataset()
+    if df is None:
+        return []
+    return sorted(df['Date of Transfer'].dt.year.unique().tolist())
+
+
+# Sales between two years (inclusive), only reading the partitions for those years
+@st.cache_data
+def load_period(start_year, end_year):
+    start = pd.Timestamp(year=start_year, month=1, day=1)
+    end = pd.Timestamp(year=end_year + 1, month=1, day=1) - pd.Timedelta(1)
+    if _partition_stats() is not None:
+        return read_date_range(start, end, out_dir=PERIOD_PARTITION_DIR)
+
+    # No partitions yet, or they were built from an older dataset (see src/partitions.py) -
+    # filter the small dataset instead
+    df = load_small_dataset()
+    if df is None:
+        return None
+    return df[df['Date of Transfer'].between(start, end)].reset_index(drop=True)
+
+
+# Sidebar slider for choosing which years a page looks at
+def period_selector():
+    years = load_available_years()
+    if len(years) < 2:
+        return (years[0], years[0]) if years else (None, None)
+    return st.sidebar.select_slider("Period", options=years, value=(years[0], years[-1]),
+                                    key='period', help="Only sales in these years are analysed")
+
+
+# Dropdown options for the Price Predictor, worked out once instead of on every rerun
+@st.cache_data
+def load_predictor_options():
+    df = load_small_dataset()
+    if df is None:
+        return None
+    return {
+        'property_types': df['Property Type'].unique().tolist(),
+        'counties': sorted(df['County'].unique()),
+        'old_new': df['Old/New'].unique().tolist(),
+        'durations': df['Duration'].unique().tolist(),
+    }
+
+
+# Price statistics for every (type, county, old/new, tenure) cell, plus the
+# (type, county) and county levels used when a cell has no sales
+@st.cache_resource
+def load_price_cube():
+    df = load_small_dataset()
+    if df is None:
+        return None
+
+    def stats(keys):
+        grouped = df.groupby(keys)['Price'].agg(['count', 'mean', 'median', 'min', 'max'])
+        return dict(zip(grouped.index, grouped.to_dict('records')))
+
+    return {
+        'cell': stats(['Property Type', 'County', 'Old/New', 'Duration']),
+        'type_county': stats(['Property Type', 'County']),
+        'county': stats('County'),
+    }
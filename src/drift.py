@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import MIN_PRICE, MAX_PRICE
+
+# Category columns whose mix we track
+SKETCH_COLUMNS = ['Property Type', 'Old/New', 'Duration', 'County']
+READ_COLUMNS = SKETCH_COLUMNS + ['Price']
+
+# Fixed log-price bins over the range the models are trained on. The fine bins double as a
+# quantile sketch (about 3% apart); each county gets coarser bins to keep the file small.
+PRICE_BINS = np.linspace(np.log10(MIN_PRICE), np.log10(MAX_PRICE), 101)
+COUNTY_PRICE_BINS = PRICE_BINS[::5]
+
+# Sales outside that range (dropped by clean_prices before training) are counted on their own,
+# overall and per county, so prices moving past the limits still show up as drift
+PRICE_RANGES = ['below', 'inside', 'above']
+
+# Usual population stability index rule of thumb: under 0.1 is stable, over 0.25 has moved
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+
+# Counties need this many sales in both datasets before their prices are compared
+MIN_COUNTY_ROWS = 50
+
+CHUNK_SIZE = 500000
+# The collected sample the model is trained from, before outliers are removed
+TRAINING_DATA = "inputs/datasets/collection/uk_housing_small.csv"
+SKETCH_PATH = "outputs/models/v1/training_sketch.json"
+
+
+# Compact summary of a dataset: counts per category, how many sales are below/inside/above the
+# model's price range, and log-price histograms of the sales inside it (overall and per county).
+# Built chunk by chunk, so its size depends on the number of categories, not rows.
+class DataSketch:
+    def __init__(self, rows=0, categories=None, prices=None, county_prices=None,
+                 price_range=None, county_price_range=None):
+        self.rows = rows
+        self.categories = categories or {column: {} for column in SKETCH_COLUMNS}
+        self.prices = np.zeros(len(PRICE_BINS) - 1, dtype=np.int64) if prices is None else np.asarray(prices)
+        self.county_prices = {county: np.asarray(counts) for county, counts in (county_prices or {}).items()}
+        self.price_range = np.zeros(len(PRICE_RANGES), dtype=np.int64) if price_range is None else np.asarray(price_range)
+        self.county_price_range = {county: np.asarray(counts)
+                                   for county, counts in (county_price_range or {}).items()}
+
+    def update(self, chunk):
+        chunk = chunk.dropna(subset=READ_COLUMNS)
+        self.rows += len(chunk)
+        for column in SKETCH_COLUMNS:
+            counts = self.categories[column]
+            for value, count in chunk[column].value_counts().items():
+                counts[value] = counts.get(value, 0) + int(count)
+
+        # 0 = below, 1 = inside, 2 = above the range clean_prices keeps
+        price, counties = chunk['Price'].to_numpy(), chunk['County'].to_numpy()
+        side = np.where(price <= MIN_PRICE, 0, np.where(price >= MAX_PRICE, 2, 1))
+        self.price_range += np.bincount(side, minlength=len(PRICE_RANGES))
+        _count_pairs(self.county_price_range, counties, side, len(PRICE_RANGES))
+
+        inside = side == 1
+        log_price = np.log10(price[inside])
+        self.prices += np.histogram(log_price, PRICE_BINS)[0]
+        county_bins = np.clip(np.searchsorted(COUNTY_PRICE_BINS, log_price, side='right') - 1,
+                              0, len(COUNTY_PRICE_BINS) - 2)
+        _count_pairs(self.county_prices, counties[inside], county_bins, len(COUNTY_PRICE_BINS) - 1)
+
+    # Approximate price quantiles, interpolating inside the histogram bins
+    def quantiles(self, qs, county=None):
+        counts, bins = (self.prices, PRICE_BINS) if county is None else (self.county_prices[county], COUNTY_PRICE_BINS)
+        cumulative = np.concatenate([[0], np.cumsum(counts)]) / max(counts.sum(), 1)
+        return 10 ** np.interp(qs, cumulative, bins)
+
+    def to_dict(self):
+        return {'rows': self.rows,
+                'categories': self.categories,
+                'prices': self.prices.tolist(),
+                'county_prices': {county: counts.tolist() for county, counts in self.county_prices.items()},
+                'price_range': self.price_range.tolist(),
+                'county_price_range': {county: counts.tolist() for county, counts in self.county_price_range.items()}}
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+
+# Add one histogram per county: count the (county, bin) pairs and add them to the county's counts
+def _count_pairs(histograms, counties, bins, n_bins):
+    pairs = pd.DataFrame({'county': counties, 'bin': bins}).value_counts()
+    for (county, price_bin), count in pairs.items():
+        if county not in histograms:
+            histograms[county] = np.zeros(n_bins, dtype=np.int64)
+        histograms[county][price_bin] += count
+
+
+def load_sketch(path=SKETCH_PATH):
+    with open(path) as f:
+        return DataSketch(**json.load(f))
+
+
+# Stream a CSV through a new sketch without loading it all
+def sketch_csv(csv_path, chunk_size=CHUNK_SIZE):
+    sketch = DataSketch()
+    for chunk in pd.read_csv(csv_path, usecols=READ_COLUMNS, chunksize=chunk_size):
+        sketch.update(chunk)
+    return sketch
+
+
+# Line up two {category: count} dicts over every category seen in either
+def _category_counts(expected, actual):
+    keys = sorted(set(expected) | set(actual))
+    return (keys, np.array([expected.get(key, 0) for key in keys], dtype=float),
+            np.array([actual.get(key, 0) for key in keys], dtype=float))
+
+
+# Counts to shares, with a tiny floor so empty bins don't give log(0)
+def _shares(expected, actual):
+    expected, actual = np.asarray(expected, dtype=float), np.asarray(actual, dtype=float)
+    expected = np.maximum(expected / max(expected.sum(), 1), 1e-6)
+    actual = np.maximum(actual / max(actual.sum(), 1), 1e-6)
+    return expected, actual
+
+
+# Population stability index between two count distributions
+def psi(expected, actual):
+    expected, actual = _shares(expected, actual)
+    return float(((actual - expected) * np.log(actual / expected)).sum())
+
+
+# Jensen-Shannon divergence (base 2, so 0 = identical and 1 = no overlap)
+def js_divergence(expected, actual):
+    expected, actual = _shares(expected, actual)
+    middle = (expected + actual) / 2
+    return float((expected * np.log2(expected / middle) + actual * np.log2(actual / middle)).sum() / 2)
+
+
+def _level(score):
+    return 'alert' if score > PSI_ALERT else ('warning' if score > PSI_WARNING else 'stable')
+
+
+def _range_shares(counts):
+    return {name: float(count / max(counts.sum(), 1)) for name, count in zip(PRICE_RANGES, counts)}
+
+
+# Median price of a county's sales inside the model's range (None if it has none)
+def _county_median(sketch, county):
+    if sketch.county_prices.get(county, np.zeros(1)).sum() == 0:
+        return None
+    return round(float(sketch.quantiles(0.5, county)), -2)
+
+
+# Compare a new dataset's sketch to the training sketch and list what has moved
+def compare_sketches(training, new, top=5):
+    report = {'rows': {'training': training.rows, 'new': new.rows}, 'features': {}, 'flagged_counties': []}
+
+    for column in SKETCH_COLUMNS:
+        keys, expected, actual = _category_counts(training.categories[column], new.categories[column])
+        score = psi(expected, actual)
+        # Categories whose share changed most (in percentage points)
+        expected_share, actual_share = expected / expected.sum(), actual / max(actual.sum(), 1)
+        changes = sorted(zip(keys, expected_share, actual_share), key=lambda k: -abs(k[2] - k[1]))[:top]
+        report['features'][column] = {
+            'psi': score, 'js': js_divergence(expected, actual), 'status': _level(score),
+            'biggest_changes': [{'value': key, 'training_share': float(e), 'new_share': float(a)}
+                                for key, e, a in changes],
+            'unseen_values': sorted(set(new.categories[column]) - set(training.categories[column])),
+        }
+
+    score = psi(training.prices, new.prices)
+    medians = training.quantiles(0.5), new.quantiles(0.5)
+    report['features']['Price'] = {
+        'psi': score, 'js': js_divergence(training.prices, new.prices), 'status': _level(score),
+        'training_quartiles': training.quantiles([0.25, 0.5, 0.75]).round(-2).tolist(),
+        'new_quartiles': new.quantiles([0.25, 0.5, 0.75]).round(-2).tolist(),
+        'median_change': float(medians[1] / medians[0] - 1),
+    }
+
+    # Share of sales outside the model's price range (left out of the price histograms above)
+    score = psi(training.price_range, new.price_range)
+    report['features']['Price range'] = {
+        'psi': score, 'js': js_divergence(training.price_range, new.price_range), 'status': _level(score),
+        'training_shares': _range_shares(training.price_range),
+        'new_shares': _range_shares(new.price_range),
+    }
+
+    # Price level per county - only where both datasets have enough sales to say. A county is
+    # flagged if its prices moved inside the range or its sales moved across the range limits.
+    for county, counts in new.county_price_range.items():
+        training_counts = training.county_price_range.get(county)
+        if training_counts is None or min(training_counts.sum(), counts.sum()) < MIN_COUNTY_ROWS:
+            continue
+        training_prices = training.county_prices.get(county, np.zeros(len(COUNTY_PRICE_BINS) - 1))
+        new_prices = new.county_prices.get(county, np.zeros(len(COUNTY_PRICE_BINS) - 1))
+        score = psi(training_counts, counts)
+        if min(training_prices.sum(), new_prices.sum()) >= MIN_COUNTY_ROWS:
+            score = max(score, psi(training_prices, new_prices))
+        if score > PSI_WARNING:
+            median_before, median_after = _county_median(training, county), _county_median(new, county)
+            report['flagged_counties'].append({
+                'county': county, 'psi': score, 'status': _level(score),
+                'training_median': median_before, 'new_median': median_after,
+                'median_change': (median_after / median_before - 1) if median_before and median_after else None,
+                'training_out_of_range_share': 1 - _range_shares(training_counts)['inside'],
+                'new_out_of_range_share': 1 - _range_shares(counts)['inside'],
+                'training_rows': int(training_counts.sum()), 'new_rows': int(counts.sum()),
+            })
+    report['flagged_counties'].sort(key=lambda c: -c['psi'])
+    return report
+
+
+def print_report(report):
+    print(f"Training rows: {report['rows']['training']:,}   New rows: {report['rows']['new']:,}")
+    for column, result in report['features'].items():
+        print(f"  {column:<15} PSI {result['psi']:.3f}  JS {result['js']:.3f}  {result['status']}")
+    print(f"  Median price change: {report['features']['Price']['median_change']:+.1%}")
+    for side in ('below', 'above'):
+        print(f"  Sales {side} the model's price range: "
+              f"{report['features']['Price range']['training_shares'][side]:.1%} -> "
+              f"{report['features']['Price range']['new_shares'][side]:.1%}")
+    for county in report['flagged_counties']:
+        median = ' -> '.join('n/a' if m is None else f"£{m:,.0f}"
+                             for m in (county['training_median'], county['new_median']))
+        print(f"  {county['status'].upper():<8}{county['county']:<30} PSI {county['psi']:.3f}  median {median}  "
+              f"outside price range {county['training_out_of_range_share']:.0%} -> {county['new_out_of_range_share']:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check new sales data for drift against the training data")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Sketch the data a model was trained on")
+    build.add_argument("--csv", default=TRAINING_DATA)
+    build.add_argument("--output", default=SKETCH_PATH)
+
+    compare = commands.add_parser("compare", help="Stream a new file and compare it to the training sketch")
+    compare.add_argument("csv")
+    compare.add_argument("--sketch", default=SKETCH_PATH)
+    compare.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    compare.add_argument("--output", default="outputs/drift/drift_report.json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "build":
+        sketch = sketch_csv(args.csv)
+        sketch.save(args.output)
+        print(f"Sketched {sketch.rows:,} rows in {time.perf_counter() - start:.1f}s -> {args.output}")
+        return
+
+    report = compare_sketches(load_sketch(args.sketch), sketch_csv(args.csv, args.chunk_size))
+    report['seconds'] = time.perf_counter() - start
+    print_report(report)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import pandas as pd
+import numpy as np
+
+# Price limits used to drop outliers before modelling
+MIN_PRICE = 50000
+MAX_PRICE = 1000000
+
+# Text columns and the number codes made from them
+CATEGORICAL_COLUMNS = {
+    'Property Type': 'Property_Type_Encoded',
+    'County': 'County_Encoded',
+    'Old/New': 'Old_New_Encoded',
+    'Duration': 'Duration_Encoded',
+}
+
+# The encoded categories on their own (for models that handle categories natively)
+CATEGORICAL_FEATURES = list(CATEGORICAL_COLUMNS.values())
+
+# All features used by the models
+FEATURES = CATEGORICAL_FEATURES + ['Type_Age_Interaction', 'County_Price_Tier', 'Type_Rarity']
+
+
+# Remove very cheap and very expensive houses
+def clean_prices(df):
+    return df[(df['Price'] > MIN_PRICE) & (df['Price'] < MAX_PRICE)].copy()
+
+
+# Add the encoded and engineered feature columns to a cleaned dataset.
+# County price tiers and type rarity are learnt from `reference` (default: the same rows) -
+# pass the training rows when scoring held-back rows so their own prices don't leak in.
+def engineer_features(df_clean, reference=None):
+    if reference is None:
+        reference = df_clean
+    df_encoded = df_clean.copy()
+
+    # Convert text to numbers so computer can understand
+    for column, encoded in CATEGORICAL_COLUMNS.items():
+        df_encoded[encoded] = pd.Categorical(df_clean[column]).codes
+
+    # Combine property type and age (new terraced vs old terraced might differ)
+    df_encoded['Type_Age_Interaction'] = (
+        df_encoded['Property_Type_Encoded'] * df_encoded['Old_New_Encoded']
+    )
+
+    # Group counties by how expensive they are (counties missing from reference get the overall average)
+    county_avg_price = reference.groupby('County')['Price'].mean()
+    county_price = df_clean['County'].map(county_avg_price).fillna(reference['Price'].mean())
+    df_encoded['County_Price_Tier'] = np.where(county_price < 250000, 0,
+                                               np.where(county_price < 400000, 1, 2))
+
+    # How common is each property type (rare types might cost more)
+    type_frequency = reference['Property Type'].value_counts(normalize=True)
+    df_encoded['Type_Rarity'] = df_clean['Property Type'].map(type_frequency).fillna(0.0)
+
+    return df_encoded
+
+
+# Category codes of the kept rows, numbered like pd.Categorical on just those rows.
+# Factorizing the whole column avoids making an object array of the strings first.
+def _category_codes(column, rows):
+    all_codes, categories = pd.factorize(column, sort=True)
+    codes = all_codes[rows]
+    # Renumber so categories that only appear in removed rows leave no gaps
+    present = np.bincount(codes, minlength=len(categories)) > 0
+    return (np.cumsum(present) - 1)[codes]
+
+
+# The same features as engineer_features, built straight into one contiguous float32
+# matrix (columns in FEATURES order) without copying the DataFrame. Returns the matrix,
+# the prices and the positions of the rows that were kept, so callers can split and
+# fold with index arrays instead of copying frames.
+def build_feature_matrix(df):
+    price = df['Price'].to_numpy()
+    rows = np.flatnonzero((price > MIN_PRICE) & (price < MAX_PRICE))
+    price = price[rows]
+
+    X = np.empty((len(rows), len(FEATURES)), dtype=np.float32)
+    codes = {}
+    for position, column in enumerate(CATEGORICAL_COLUMNS):
+        codes[column] = _category_codes(df[column], rows)
+        X[:, position] = codes[column]
+
+    X[:, FEATURES.index('Type_Age_Interaction')] = codes['Property Type'] * codes['Old/New']
+
+    # County price tier from each county's average price (0: under £250k, 1: under £400k, 2: above)
+    county_counts = np.bincount(codes['County'])
+    county_avg_price = np.bincount(codes['County'], weights=price) / np.maximum(county_counts, 1)
+    X[:, FEATURES.index('County_Price_Tier')] = np.digitize(county_avg_price, [250000, 400000])[codes['County']]
+
+    # Share of sales that are this property type
+    type_counts = np.bincount(codes['Property Type'])
+    X[:, FEATURES.index('Type_Rarity')] = (type_counts / len(rows))[codes['Property Type']]
+
+    return X, price.astype(np.float64), rows
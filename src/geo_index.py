@@ -0,0 +1,86 @@
+# Geography levels from broadest to most local
+GEO_LEVELS = ['County', 'District', 'Town/City']
+
+# Every geography cell is split by these so a flat and a detached house don't share an estimate
+SEGMENT_COLUMNS = ['Property Type', 'Duration']
+
+# How many sales a cell needs before its own average counts as much as its parent's
+DEFAULT_SHRINKAGE = 20
+
+
+# Hierarchical price index: County -> District -> Town/City, crossed with type and tenure.
+# Small local cells are pulled towards their parent level so a district with 3 sales
+# doesn't give a wild estimate, while busy districts mostly keep their own average.
+class GeoPriceIndex:
+    def __init__(self, levels, national, children, shrinkage):
+        # levels[d] maps (type, tenure, county, ...) -> (estimate, sales count)
+        self.levels = levels
+        self.national = national
+        self.children = children
+        self.shrinkage = shrinkage
+
+    # Walk down the hierarchy as far as we have data - one dict lookup per level
+    def estimate(self, property_type, duration, county=None, district=None, town=None):
+        key = (property_type, duration)
+        estimate, count = self.national.get(key, (None, 0))
+        level = 'National'
+
+        for depth, value in enumerate([county, district, town]):
+            if value is None:
+                break
+            key = key + (value,)
+            found = self.levels[depth].get(key)
+            if found is None:
+                break
+            estimate, count = found
+            level = GEO_LEVELS[depth]
+
+        return {'estimate': estimate, 'count': count, 'level': level}
+
+    # Districts in a county, or towns in a district, for building dropdowns
+    def districts(self, county):
+        return self.children.get((county,), [])
+
+    def towns(self, county, district):
+        return self.children.get((county, district), [])
+
+
+# Build the whole index with one groupby per level - no loops over rows
+def build_geo_index(df, shrinkage=DEFAULT_SHRINKAGE):
+    df = df[SEGMENT_COLUMNS + GEO_LEVELS + ['Price']].dropna()
+    overall_mean = df['Price'].mean()
+
+    # Top of the tree: average per type and tenure across the whole country
+    parent = df.groupby(SEGMENT_COLUMNS)['Price'].agg(['sum', 'count'])
+    parent['estimate'] = (parent['sum'] + shrinkage * overall_mean) / (parent['count'] + shrinkage)
+    national = dict(zip(parent.index, zip(parent['estimate'], parent['count'])))
+
+    levels = []
+    for depth in range(len(GEO_LEVELS)):
+        parent_keys = SEGMENT_COLUMNS + GEO_LEVELS[:depth]
+        keys = parent_keys + [GEO_LEVELS[depth]]
+
+        cells = df.groupby(keys)['Price'].agg(['sum', 'count']).reset_index()
+
+        # Line each cell up with its parent's (already shrunk) estimate
+        parent_estimate = parent['estimate'].rename('parent_estimate')
+        cells = cells.join(parent_estimate, on=parent_keys)
+
+        # Weighted blend: n sales of local evidence against `shrinkage` sales worth of parent
+        cells['estimate'] = (
+            (cells['sum'] + shrinkage * cells['parent_estimate']) / (cells['count'] + shrinkage)
+        )
+
+        cell_keys = list(cells[keys].itertuples(index=False, name=None))
+        levels.append(dict(zip(cell_keys, zip(cells['estimate'], cells['count']))))
+        parent = cells.set_index(keys)[['estimate']]
+
+    # Lookup lists for the location dropdowns
+    children = {}
+    places = df[GEO_LEVELS].drop_duplicates()
+    for county, districts in places.groupby('County')['District']:
+        children[(county,)] = sorted(districts.unique())
+    for (county, district), towns in places.groupby(['County', 'District'])['Town/City']:
+        children[(county, district)] = sorted(towns.unique())
+
+    return GeoPriceIndex(levels, national, children, shrinkage)
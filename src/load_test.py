@@ -0,0 +1,172 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Typical visits - each simulated session follows one of these from start to finish.
+# A step is a page to open, a dropdown to change, or a button to press.
+SCENARIOS = {
+    'browser': [
+        ('page', 'Project Summary'),
+        ('page', 'Property Analysis'),
+        ('page', 'Project Hypothesis'),
+    ],
+    'valuer': [
+        ('page', 'Price Predictor'),
+        ('select', 'County'),
+        ('select', 'Property Type'),
+        ('click', 'Predict Price'),
+        ('select', 'County'),
+        ('click', 'Predict Price'),
+    ],
+    'analyst': [
+        ('page', 'Property Analysis'),
+        ('page', 'ML Performance'),
+    ],
+}
+
+
+# Run one step of a scenario against a headless app session
+def run_step(at, action, target, rng):
+    if action == 'page':
+        pages = at.sidebar.selectbox[0]
+        pages.select_index(pages.options.index(target))
+    elif action == 'select':
+        widget = next(w for w in at.selectbox if w.label == target)
+        widget.select_index(int(rng.integers(len(widget.options))))
+    elif action == 'click':
+        next(b for b in at.button if b.label == target).click()
+    return at.run()
+
+
+# Sessions run in separate worker processes, each with its own caches and GIL. A real
+# deployment runs every session as a thread of one Streamlit process sharing caches and one
+# GIL, so this can't show sessions waiting on each other (e.g. everyone stalling while one
+# visitor retrains the ML models) - only how long each page takes once a worker is warm.
+LIMITATION = ("Each concurrent session runs in its own worker process with its own caches, "
+              "so contention between sessions inside one Streamlit server is not measured.")
+
+
+# Run once in each worker before any timing: imports and the first data load
+def warm_worker(timeout):
+    AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+
+
+# Blocks until every worker is running one of these, so all of them have been started and warmed
+def wait_for_workers(barrier):
+    barrier.wait()
+
+
+# One simulated user: open the app, then work through the scenario timing every rerun
+def run_session(session_id, scenario, timeout, seed):
+    rng = np.random.default_rng(seed + session_id)
+    timings = []
+
+    # Opening the app is reported on its own row, not as part of the first page
+    start = time.perf_counter()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    timings.append({'page': 'App start', 'step': 'open app', 'seconds': time.perf_counter() - start,
+                    'error': bool(at.exception)})
+    page = 'Project Summary'
+
+    for action, target in SCENARIOS[scenario]:
+        if action == 'page':
+            page = target
+        start = time.perf_counter()
+        try:
+            at = run_step(at, action, target, rng)
+            error = bool(at.exception)
+        except Exception:
+            error = True
+        timings.append({'page': page, 'step': f"{action} {target}",
+                        'seconds': time.perf_counter() - start, 'error': error})
+
+    return timings
+
+
+# Latency percentiles and throughput for each page
+def summarise(timings, wall_seconds):
+    report = {}
+    for page in sorted({t['page'] for t in timings}):
+        seconds = np.array([t['seconds'] for t in timings if t['page'] == page])
+        report[page] = {
+            'requests': int(len(seconds)),
+            'errors': sum(t['error'] for t in timings if t['page'] == page),
+            'throughput_per_sec': len(seconds) / wall_seconds,
+            'p50_ms': float(np.percentile(seconds, 50) * 1000),
+            'p95_ms': float(np.percentile(seconds, 95) * 1000),
+            'p99_ms': float(np.percentile(seconds, 99) * 1000),
+            'max_ms': float(seconds.max() * 1000),
+        }
+    return report
+
+
+def run_load_test(sessions=10, concurrency=5, scenarios=None, timeout=300, seed=42):
+    scenarios = scenarios or list(SCENARIOS)
+    plan = [scenarios[i % len(scenarios)] for i in range(sessions)]
+
+    # One AppTest per worker process: AppTest swaps a process-wide Streamlit runtime in and
+    # out on every run, so sessions can't share a process (see LIMITATION).
+    # AppTest also replaces __main__ in the worker, so the functions are sent by their module path.
+    from src.load_test import run_session as session_runner, wait_for_workers as workers_ready, \
+        warm_worker as worker_warmer
+
+    with multiprocessing.Manager() as manager, \
+            ProcessPoolExecutor(max_workers=concurrency, initializer=worker_warmer, initargs=(timeout,)) as pool:
+        # Start and warm every worker before the clock starts
+        barrier = manager.Barrier(concurrency)
+        list(pool.map(workers_ready, [barrier] * concurrency))
+
+        start = time.perf_counter()
+        results = list(pool.map(session_runner, range(sessions), plan,
+                                [timeout] * sessions, [seed] * sessions))
+        wall_seconds = time.perf_counter() - start
+
+    timings = [t for session in results for t in session]
+    return {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'scenarios': scenarios,
+        'wall_seconds': wall_seconds,
+        'total_requests': len(timings),
+        'throughput_per_sec': len(timings) / wall_seconds,
+        'pages': summarise(timings, wall_seconds),
+        'limitation': LIMITATION,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent users against the Streamlit app")
+    parser.add_argument("--sessions", type=int, default=10, help="Total number of simulated visits")
+    parser.add_argument("--concurrency", type=int, default=5, help="How many visits run at the same time")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run (repeat for several, default: all)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per rerun")
+    parser.add_argument("--output", default="outputs/load_tests/load_test_results.json")
+    args = parser.parse_args()
+
+    report = run_load_test(args.sessions, args.concurrency, args.scenario, args.timeout)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{report['total_requests']} reruns in {report['wall_seconds']:.1f}s "
+          f"({report['throughput_per_sec']:.2f}/s) with {args.concurrency} concurrent sessions")
+    print(f"{'Page':<22}{'Requests':>10}{'Errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for page, stats in report['pages'].items():
+        print(f"{page:<22}{stats['requests']:>10}{stats['errors']:>8}"
+              f"{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}{stats['p99_ms']:>10.0f}")
+    print(f"Note: {LIMITATION}")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
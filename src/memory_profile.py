@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from src import data_manager
+from src.partitions import file_sha256, write_partitions
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+BUDGETS_FILE = os.path.join(os.path.dirname(APP_PATH), "tests", "memory_budgets.json")
+
+PAGES = ['Project Summary', 'Property Analysis', 'Price Predictor', 'Project Hypothesis', 'ML Performance']
+
+MB = 1024 * 1024
+
+
+# Point the app's data loaders at a different dataset (and its year partitions) for a while
+@contextmanager
+def use_dataset(df):
+    saved = data_manager.SMALL_DATASET_PATH, data_manager.PERIOD_PARTITION_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "dataset.csv")
+        df.to_csv(csv_path, index=False)
+        write_partitions([df], os.path.join(tmp, "partitions"), file_sha256(csv_path))
+
+        data_manager.SMALL_DATASET_PATH = csv_path
+        data_manager.PERIOD_PARTITION_DIR = os.path.join(tmp, "partitions")
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        try:
+            yield
+        finally:
+            data_manager.SMALL_DATASET_PATH, data_manager.PERIOD_PARTITION_DIR = saved
+            st.cache_data.clear()
+            st.cache_resource.clear()
+
+
+# Records the peak memory of each "#### ..." section a page writes
+class SectionTracker:
+    def __init__(self):
+        self.sections = {}
+        self.current = 'Page start'
+
+    def write(self, *args, **kwargs):
+        text = args[0] if args and isinstance(args[0], str) else ''
+        if text.startswith('#### '):
+            self.close_section()
+            self.current = text[5:].strip()
+        return self.original_write(*args, **kwargs)
+
+    def close_section(self):
+        peak = tracemalloc.get_traced_memory()[1] - self.baseline
+        self.sections[self.current] = max(self.sections.get(self.current, 0), peak / MB)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def tracking(self):
+        self.original_write = st.write
+        st.write = self.write
+        try:
+            yield self
+        finally:
+            st.write = self.original_write
+
+
+# Open one page headlessly and measure how much memory it allocates on top of what's already held.
+# Note: work done in joblib worker processes (cross_val_score with n_jobs=-1) isn't counted.
+def profile_page(at, title):
+    pages = at.sidebar.selectbox[0]
+    pages.select_index(pages.options.index(title))
+
+    tracker = SectionTracker()
+    tracemalloc.start()
+    tracker.baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        with tracker.tracking():
+            at.run()
+        tracker.close_section()
+        page_peak = max(tracker.sections.values())
+    finally:
+        tracemalloc.stop()
+
+    if at.exception:
+        raise RuntimeError(f"{title} failed: {at.exception[0].value}")
+    return {'peak_mb': page_peak, 'sections': tracker.sections}
+
+
+# One-off costs (imports, Plotly templates) would otherwise land on whichever page runs first
+_warmed_up = False
+
+
+def _warm_up(df, pages):
+    global _warmed_up
+    if _warmed_up:
+        return
+    with use_dataset(df.head(500)):
+        at = AppTest.from_file(APP_PATH, default_timeout=600).run()
+        for title in pages:
+            at.sidebar.selectbox[0].select_index(at.sidebar.selectbox[0].options.index(title))
+            at.run()
+    _warmed_up = True
+
+
+# Profile every page against the given dataset. Data loading happens first so each
+# page's numbers are what it adds on top of the shared, cached dataset.
+def profile_pages(df, pages=PAGES):
+    _warm_up(df, pages)
+    with use_dataset(df):
+        at = AppTest.from_file(APP_PATH, default_timeout=600).run()
+        return {title: profile_page(at, title) for title in pages}
+
+
+# Resample the dataset (with replacement) to each size and profile the pages at each
+def profile_sizes(df, sizes, pages=PAGES):
+    results = {}
+    for size in sizes:
+        sample = df.sample(n=size, replace=size > len(df), random_state=42).reset_index(drop=True)
+        results[size] = profile_pages(sample, pages)
+    return results
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+
+# Every dataset size that has a budget for at least one page
+def budgeted_sizes(budgets):
+    return sorted({int(size) for page in budgets.values() for size in page})
+
+
+# Every (page, size) whose peak memory went over its budget
+def over_budget(results, budgets):
+    failures = []
+    for size, pages in results.items():
+        for title, profile in pages.items():
+            budget = budgets.get(title, {}).get(str(size))
+            if budget is not None and profile['peak_mb'] > budget:
+                failures.append(f"{title} at {size:,} rows: {profile['peak_mb']:.1f} MB > {budget} MB budget")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure peak memory of each page at several dataset sizes")
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        help="Dataset sizes to profile (default: every size in the budgets file)")
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="JSON of MB budgets per page and size")
+    parser.add_argument("--output", default="outputs/memory/memory_profile.json")
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets)
+    sizes = args.sizes or budgeted_sizes(budgets)
+    unbudgeted = [size for size in sizes if size not in budgeted_sizes(budgets)]
+    if unbudgeted:
+        print(f"No budgets for {', '.join(f'{size:,}' for size in unbudgeted)} rows - measured only")
+
+    df = pd.read_csv(data_manager.SMALL_DATASET_PATH)
+    results = profile_sizes(df, sizes, args.pages)
+
+    for size, pages in results.items():
+        print(f"\n{size:,} rows")
+        for title, profile in pages.items():
+            print(f"  {title:<22}{profile['peak_mb']:>8.1f} MB peak")
+            for section, peak in profile['sections'].items():
+                print(f"      {section:<40}{peak:>8.1f} MB")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nResults saved to: {args.output}")
+
+    failures = over_budget(results, budgets)
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
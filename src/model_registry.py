@@ -0,0 +1,55 @@
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from src.feature_engineering import CATEGORICAL_FEATURES, FEATURES
+
+# Models that read the category codes directly instead of the hand-made features
+NATIVE_CATEGORICAL_MODELS = ['Gradient Boosting']
+
+# Lower and upper quantiles for the gradient boosting price range (80% interval)
+INTERVAL_QUANTILES = (0.1, 0.9)
+
+
+# Histogram gradient boosting bins each feature, so it trains quickly on millions
+# of rows, and splits on groups of categories rather than on their code order
+def _gradient_boosting(**kwargs):
+    return HistGradientBoostingRegressor(
+        categorical_features=[True] * len(CATEGORICAL_FEATURES),
+        max_iter=200,
+        learning_rate=0.1,
+        early_stopping=True,
+        random_state=42,
+        **kwargs
+    )
+
+
+# Every model we compare, created fresh each time it's needed
+MODEL_REGISTRY = {
+    'Linear Regression': lambda: LinearRegression(),  # Simplest model
+    'Decision Tree': lambda: DecisionTreeRegressor(max_depth=10, random_state=42),  # Tree-based
+    'Random Forest': lambda: RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42),  # Many trees
+    'K-Nearest Neighbors': lambda: KNeighborsRegressor(n_neighbors=10),  # Looks at similar properties
+    'Gradient Boosting': _gradient_boosting,  # Boosted trees with native categories
+}
+
+
+def build_models(names=None):
+    return {name: MODEL_REGISTRY[name]() for name in (names or MODEL_REGISTRY)}
+
+
+# Which feature columns a model is trained on
+def model_features(name):
+    return CATEGORICAL_FEATURES if name in NATIVE_CATEGORICAL_MODELS else FEATURES
+
+
+# The same columns as a slice of the build_feature_matrix matrix (the categories come first,
+# so slicing gives a view rather than a copy)
+def model_columns(name):
+    return slice(0, len(model_features(name)))
+
+
+# One gradient boosting model per quantile, giving a low and high price estimate
+def build_interval_models(quantiles=INTERVAL_QUANTILES):
+    return {q: _gradient_boosting(loss='quantile', quantile=q) for q in quantiles}
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.zip_reader import LAND_REGISTRY_SCHEMA
+
+PARTITION_DIR = "inputs/datasets/collection/partitions"
+STATS_FILE = "_stats.json"
+
+# Column types of the partition files: the Land Registry columns with text kept as plain strings.
+# Fixed up front because a chunk where a column is all empty would otherwise get a different type.
+PARTITION_TYPES = {'Price': pa.int64(), 'Date of Transfer': pa.timestamp('us')}
+PARTITION_SCHEMA = pa.schema([(name, PARTITION_TYPES.get(name, pa.large_string()))
+                              for name in LAND_REGISTRY_SCHEMA])
+
+
+def _partition_file(year):
+    return f"year={year}.parquet"
+
+
+# SHA-256 of a file, to record which version of the dataset the partitions were built from
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Split a dataset into one Parquet file per transfer year, with real dates instead of text.
+# Works chunk by chunk so it can also partition the full multi-GB Land Registry file.
+# source_hash (see file_sha256) is saved with the stats so readers can tell when they're out of date.
+def write_partitions(chunks, out_dir=PARTITION_DIR, source_hash=None):
+    os.makedirs(out_dir, exist_ok=True)
+    writers, stats = {}, {}
+
+    try:
+        for chunk in chunks:
+            chunk = chunk.copy()
+            chunk['Date of Transfer'] = pd.to_datetime(chunk['Date of Transfer'])
+            for year, part in chunk.groupby(chunk['Date of Transfer'].dt.year):
+                if year not in writers:
+                    writers[year] = pq.ParquetWriter(os.path.join(out_dir, _partition_file(year)), PARTITION_SCHEMA)
+                table = pa.Table.from_pandas(part[PARTITION_SCHEMA.names], preserve_index=False)
+                writers[year].write_table(table.cast(writers[year].schema))
+
+                # Per-partition min/max so readers can skip files without opening them
+                new = {'rows': len(part),
+                       'min_date': part['Date of Transfer'].min(), 'max_date': part['Date of Transfer'].max(),
+                       'min_price': int(part['Price'].min()), 'max_price': int(part['Price'].max())}
+                old = stats.get(year)
+                if old:
+                    new = {'rows': old['rows'] + new['rows'],
+                           'min_date': min(old['min_date'], new['min_date']),
+                           'max_date': max(old['max_date'], new['max_date']),
+                           'min_price': min(old['min_price'], new['min_price']),
+                           'max_price': max(old['max_price'], new['max_price'])}
+                stats[year] = new
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    stats = {
+        str(year): {**s, 'file': _partition_file(year),
+                    'min_date': s['min_date'].isoformat(), 'max_date': s['max_date'].isoformat()}
+        for year, s in sorted(stats.items())
+    }
+    with open(os.path.join(out_dir, STATS_FILE), 'w') as f:
+        json.dump({'source_sha256': source_hash, 'years': stats}, f, indent=4)
+    return stats
+
+
+def write_partitions_from_csv(csv_path, out_dir=PARTITION_DIR, chunksize=500000):
+    return write_partitions(pd.read_csv(csv_path, chunksize=chunksize), out_dir, file_sha256(csv_path))
+
+
+# Stats for each year's partition, or None if there are no partitions. Passing source_hash
+# also gives None when the partitions were built from a different version of the dataset.
+def load_stats(out_dir=PARTITION_DIR, source_hash=None):
+    try:
+        with open(os.path.join(out_dir, STATS_FILE)) as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return None
+    if source_hash is not None and saved.get('source_sha256') != source_hash:
+        return None
+    return saved.get('years')
+
+
+# Read only the partitions whose date range overlaps [start, end].
+# Partitions fully inside the range are used as they are; only the edge ones are filtered.
+def read_date_range(start=None, end=None, columns=None, out_dir=PARTITION_DIR):
+    stats = load_stats(out_dir)
+    if stats is None:
+        raise FileNotFoundError(f"No partitions found in {out_dir}")
+
+    start = pd.Timestamp.min if start is None else pd.Timestamp(start)
+    end = pd.Timestamp.max if end is None else pd.Timestamp(end)
+
+    # The date column is always needed for filtering the edge partitions
+    read_columns = columns
+    if columns is not None and 'Date of Transfer' not in columns:
+        read_columns = list(columns) + ['Date of Transfer']
+
+    parts = []
+    for s in stats.values():
+        min_date, max_date = pd.Timestamp(s['min_date']), pd.Timestamp(s['max_date'])
+        if max_date < start or min_date > end:
+            continue
+        part = pd.read_parquet(os.path.join(out_dir, s['file']), columns=read_columns)
+        if min_date < start or max_date > end:
+            part = part[part['Date of Transfer'].between(start, end)]
+        parts.append(part if columns is None else part[columns])
+
+    if not parts:
+        first_file = os.path.join(out_dir, next(iter(stats.values()))['file'])
+        return pd.read_parquet(first_file, columns=columns).iloc[0:0]
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,317 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import FEATURES, clean_prices, engineer_features
+from src.partitions import PARTITION_DIR, STATS_FILE, write_partitions_from_csv
+from src.zip_reader import RAW_ZIP, read_zip_csv
+
+SMALL_CSV = "inputs/datasets/collection/uk_housing_small.csv"
+
+# Code files each stage depends on - editing one makes the stage out of date
+PIPELINE_CODE = ["src/pipeline.py"]
+FEATURE_CODE = PIPELINE_CODE + ["src/feature_engineering.py"]
+MODEL_CODE = FEATURE_CODE + ["src/model_registry.py"]
+
+# Same search space as notebook 03
+PARAM_GRID = {
+    'n_estimators': [50, 100, 150],
+    'max_depth': [5, 10, 15],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2', None],
+    'bootstrap': [True, False]
+}
+
+
+# One step of the pipeline: a function that turns input files into output files
+class Stage:
+    def __init__(self, name, run, inputs, outputs, code):
+        self.name = name
+        self.run = run
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = code
+
+
+# ---- Stage functions (replace notebooks 01-04) ----
+
+# Notebook 01: take a 20,000 row sample of the Land Registry file (read straight from the Kaggle zip)
+def collect(inputs, outputs):
+    df = read_zip_csv(inputs[0])
+    df_small = df.sample(n=min(20000, len(df)), random_state=42)
+    df_small.to_csv(outputs[0], index=False)
+
+
+# Year partitions of the app's dataset so pages can load just the years they show
+def partition(inputs, outputs):
+    write_partitions_from_csv(inputs[0], os.path.dirname(outputs[0]))
+
+
+# Notebook 02: remove outliers and add the engineered features
+def prepare(inputs, outputs):
+    df = pd.read_csv(inputs[0])
+    engineer_features(clean_prices(df)).to_csv(outputs[0], index=False)
+
+
+def _split(prepared_csv):
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(prepared_csv)
+    return train_test_split(df, df['Price'], test_size=0.2, random_state=42)
+
+
+# Notebook 03: tune the random forest with grid search and save it
+def train_model(inputs, outputs):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import GridSearchCV
+
+    X_train, _, y_train, _ = _split(inputs[0])
+    grid_search = GridSearchCV(RandomForestRegressor(random_state=42), PARAM_GRID,
+                               cv=3, scoring='r2', n_jobs=-1)
+    grid_search.fit(X_train[FEATURES], y_train)
+
+    with open(outputs[0], 'wb') as file:
+        pickle.dump(grid_search.best_estimator_, file)
+    with open(outputs[1], 'wb') as file:
+        pickle.dump(FEATURES, file)
+
+
+# Notebook 03 comparison table: every registry model on the same split
+def compare_models(inputs, outputs):
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from src.model_registry import build_models, model_features
+
+    X_train, X_test, y_train, y_test = _split(inputs[0])
+    comparison = {}
+    for name, model in build_models().items():
+        model.fit(X_train[model_features(name)], y_train)
+        test_pred = model.predict(X_test[model_features(name)])
+        comparison[name] = {'test_r2': r2_score(y_test, test_pred),
+                            'test_mae': mean_absolute_error(y_test, test_pred)}
+
+    with open(outputs[0], 'w') as f:
+        json.dump(comparison, f, indent=4)
+
+
+# Compact summary of the training data kept next to the model, for `python -m src.drift compare`.
+# Sketched before outliers are removed so the share of sales outside the price range is known too.
+def sketch(inputs, outputs):
+    from src.drift import sketch_csv
+
+    sketch_csv(inputs[0]).save(outputs[0])
+
+
+# Notebook 04: score the saved model and record whether it meets the requirements
+def evaluate(inputs, outputs):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    with open(inputs[1], 'rb') as file:
+        model = pickle.load(file)
+    with open(inputs[2], 'rb') as file:
+        features = pickle.load(file)
+
+    X_train, X_test, y_train, y_test = _split(inputs[0])
+    train_pred = model.predict(X_train[features])
+    test_pred = model.predict(X_test[features])
+
+    evaluation_results = {
+        'model_type': 'Random Forest (Optimized)',
+        'train_r2': float(r2_score(y_train, train_pred)),
+        'test_r2': float(r2_score(y_test, test_pred)),
+        'train_mae': float(mean_absolute_error(y_train, train_pred)),
+        'test_mae': float(mean_absolute_error(y_test, test_pred)),
+        'train_rmse': float(np.sqrt(mean_squared_error(y_train, train_pred))),
+        'test_rmse': float(np.sqrt(mean_squared_error(y_test, test_pred))),
+        'meets_requirements': bool(r2_score(y_test, test_pred) >= 0.3)
+    }
+    with open(outputs[0], 'w') as f:
+        json.dump(evaluation_results, f, indent=4)
+
+
+# All stages for one output version. A stage depends on whichever stage writes its inputs.
+def build_stages(version='v1'):
+    prepared = f"outputs/datasets/prepared/{version}/prepared_data.csv"
+    model_dir = f"outputs/models/{version}"
+    model = f"{model_dir}/price_prediction_model.pkl"
+    features = f"{model_dir}/features.pkl"
+
+    return [
+        Stage('collect', collect, [RAW_ZIP], [SMALL_CSV], PIPELINE_CODE + ["src/zip_reader.py"]),
+        Stage('prepare', prepare, [SMALL_CSV], [prepared], FEATURE_CODE),
+        Stage('partition', partition, [SMALL_CSV], [f"{PARTITION_DIR}/{STATS_FILE}"],
+              PIPELINE_CODE + ["src/partitions.py"]),
+        Stage('model', train_model, [prepared], [model, features], FEATURE_CODE),
+        Stage('sketch', sketch, [SMALL_CSV], [f"{model_dir}/training_sketch.json"],
+              FEATURE_CODE + ["src/drift.py"]),
+        Stage('compare', compare_models, [prepared], [f"{model_dir}/model_comparison.json"], MODEL_CODE),
+        Stage('evaluate', evaluate, [prepared, model, features],
+              [f"{model_dir}/evaluation_results.json"], PIPELINE_CODE),
+    ]
+
+
+# ---- Content hashing and staleness ----
+
+# Hash a file's contents, reusing the previous hash when size and modified time haven't changed
+def file_hash(path, known):
+    stat = os.stat(path)
+    previous = known.get(path)
+    if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+        return previous['sha256']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    known[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    return known[path]['sha256']
+
+
+def manifest_path(version):
+    return f"outputs/pipeline/{version}/manifest.json"
+
+
+def load_manifest(version):
+    try:
+        with open(manifest_path(version)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'files': {}, 'stages': {}}
+
+
+def save_manifest(version, manifest):
+    os.makedirs(os.path.dirname(manifest_path(version)), exist_ok=True)
+    with open(manifest_path(version), 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+
+def _hashes(paths, known):
+    return {path: file_hash(path, known) for path in paths}
+
+
+# A stage needs to run if an output is missing or any input, code or output changed since last run
+def is_stale(stage, manifest):
+    missing = [path for path in stage.inputs if not os.path.exists(path)]
+    if missing:
+        # e.g. the multi-GB raw file was deleted after collection - keep what we have
+        if all(os.path.exists(path) for path in stage.outputs):
+            print(f"[{stage.name}] inputs {missing} not found, keeping existing outputs")
+            return False
+        raise FileNotFoundError(f"Stage '{stage.name}' needs {missing}")
+
+    record = manifest['stages'].get(stage.name)
+    if record is None or not all(os.path.exists(path) for path in stage.outputs):
+        return True
+    known = manifest['files']
+    return (record['inputs'] != _hashes(stage.inputs + stage.code, known)
+            or record['outputs'] != _hashes(stage.outputs, known))
+
+
+# Runs in a worker process
+def _run_stage(stage):
+    for path in stage.outputs:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    start = time.perf_counter()
+    stage.run(stage.inputs, stage.outputs)
+    return time.perf_counter() - start
+
+
+# ---- Runner ----
+
+# The requested stages plus every stage they (indirectly) read outputs from
+def _with_upstream(stages, targets):
+    producer = {path: stage for stage in stages for path in stage.outputs}
+    needed, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        stage = next(s for s in stages if s.name == name)
+        todo += [producer[path].name for path in stage.inputs if path in producer]
+    return [stage for stage in stages if stage.name in needed]
+
+
+# Run stale stages as soon as the stages they depend on are done, several at a time
+def run_pipeline(version='v1', targets=None, force=False, jobs=2, dry_run=False):
+    stages = build_stages(version)
+    if targets:
+        stages = _with_upstream(stages, targets)
+    producer = {path: stage.name for stage in stages for path in stage.outputs}
+    depends_on = {stage.name: {producer[p] for p in stage.inputs if p in producer} for stage in stages}
+
+    manifest = load_manifest(version)
+    pending = {stage.name: stage for stage in stages}
+    done, running, report = set(), {}, {}
+    would_run = set()
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Start every stage whose dependencies have all finished
+            for name, stage in list(pending.items()):
+                if not depends_on[name] <= done:
+                    continue
+                del pending[name]
+                # In a dry run a stage also runs if one it depends on would have run, without
+                # checking its own inputs (they may not exist yet)
+                stale = force or (dry_run and depends_on[name] & would_run) or is_stale(stage, manifest)
+                if not stale:
+                    print(f"[{name}] up to date")
+                    report[name] = 'up to date'
+                    done.add(name)
+                elif dry_run:
+                    print(f"[{name}] would run")
+                    report[name] = 'would run'
+                    would_run.add(name)
+                    done.add(name)
+                else:
+                    print(f"[{name}] running...")
+                    running[pool.submit(_run_stage, stage)] = stage
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                seconds = future.result()
+                known = manifest['files']
+                manifest['stages'][stage.name] = {
+                    'inputs': _hashes(stage.inputs + stage.code, known),
+                    'outputs': _hashes(stage.outputs, known),
+                    'seconds': round(seconds, 2),
+                }
+                save_manifest(version, manifest)
+                print(f"[{stage.name}] finished in {seconds:.1f}s")
+                report[stage.name] = 'ran'
+                done.add(stage.name)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data -> model pipeline, skipping up-to-date stages")
+    parser.add_argument("stages", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--version", default="v1", help="Output version folder, e.g. v1")
+    parser.add_argument("--force", action="store_true", help="Run stages even if up to date")
+    parser.add_argument("--jobs", type=int, default=2, help="Stages allowed to run at the same time")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would run")
+    args = parser.parse_args()
+
+    names = [stage.name for stage in build_stages(args.version)]
+    unknown = [name for name in args.stages if name not in names]
+    if unknown:
+        parser.error(f"unknown stage(s) {unknown}, choose from {names}")
+
+    run_pipeline(args.version, args.stages, args.force, args.jobs, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+from plotly.offline import get_plotlyjs_version
+
+from src import data_manager
+from src.partitions import STATS_FILE
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+
+# Served by Streamlit at /app/static/reports/<version>/ when server.enableStaticServing is on
+REPORT_DIR = os.path.join(ROOT_DIR, "static", "reports")
+
+# Read-only pages that show the same thing to every visitor for a given dataset
+REPORT_PAGES = ['Project Summary', 'Property Analysis', 'Project Hypothesis']
+
+# Code that decides what these pages show - editing it gives a new report version
+PAGE_CODE = ['app_pages/page_summary.py', 'app_pages/page_property_analysis.py',
+             'app_pages/page_project_hypothesis.py', 'src/data_manager.py']
+
+# Set while building so the pages are rendered live, not replayed from an old report
+_building = False
+
+
+# ---- Versions ----
+
+@st.cache_data
+def _hash_files(files):
+    digest = hashlib.sha256()
+    for path, _ in files:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+# Content hash of the dataset and page code. Only re-hashed when a file's modified time changes.
+def report_version():
+    paths = [data_manager.SMALL_DATASET_PATH, os.path.join(data_manager.PERIOD_PARTITION_DIR, STATS_FILE)]
+    paths += [os.path.join(ROOT_DIR, path) for path in PAGE_CODE]
+    files = tuple((path, os.stat(path).st_mtime_ns) for path in paths if os.path.exists(path))
+    return _hash_files(files)
+
+
+# ---- Building ----
+
+# Turn a rendered page (AppTest element tree) into plain JSON items
+def _elements(block):
+    items = []
+    for element in block.children.values():
+        kind = element.type
+        if kind == 'title':
+            continue  # the app title, drawn by MultiPage on every page
+        elif kind == 'markdown':
+            items.append({'type': 'markdown', 'body': element.value})
+        elif kind in ('info', 'success', 'warning', 'error'):
+            items.append({'type': 'alert', 'kind': kind, 'body': element.value})
+        elif kind == 'metric':
+            items.append({'type': 'metric', 'label': element.label, 'value': element.value,
+                          'delta': element.delta or None})
+        elif kind == 'dataframe':
+            items.append({'type': 'dataframe',
+                          'data': json.loads(element.value.to_json(orient='split', date_format='iso'))})
+        elif kind == 'plotly_chart':
+            items.append({'type': 'plotly', 'spec': json.loads(element.proto.spec)})
+        elif kind == 'flex_container':
+            items.append({'type': 'columns', 'columns': [_elements(column) for column in element.children.values()]})
+        else:
+            raise ValueError(f"Don't know how to pre-render a '{kind}' element")
+    return items
+
+
+# Render the read-only pages headlessly with the default period and collect what they show
+def render_report(pages=REPORT_PAGES):
+    global _building
+    from streamlit.testing.v1 import AppTest
+
+    _building = True
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=300).run()
+        report = {'version': report_version(), 'period': None, 'pages': {}}
+        for title in pages:
+            page_select = at.sidebar.selectbox[0]
+            page_select.select_index(page_select.options.index(title))
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"{title} page failed: {at.exception[0].value}")
+            report['pages'][title] = _elements(at.main)
+            if at.sidebar.select_slider:
+                report['period'] = list(at.sidebar.select_slider[0].value)
+    finally:
+        _building = False
+    return report
+
+
+def _slug(title):
+    return title.lower().replace(' ', '-')
+
+
+# Just enough Markdown for what the pages write: headings, rules, lists, bold and italics
+def _markdown_html(text):
+    def inline(line):
+        line = html.escape(line)
+        line = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', line)
+        return re.sub(r'\*(.+?)\*', r'<em>\1</em>', line)
+
+    out, paragraph, list_tag = [], [], None
+    for line in [line.strip() for line in text.split('\n')] + ['']:
+        item = re.match(r'^(-|\d+\.)\s+(.*)', line)
+        if paragraph and (not line or item or line.startswith('#') or line == '---'):
+            out.append(f"<p>{' '.join(paragraph)}</p>")
+            paragraph = []
+        if list_tag and not item:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+
+        if item:
+            tag = 'ul' if item.group(1) == '-' else 'ol'
+            if list_tag != tag:
+                if list_tag:
+                    out.append(f"</{list_tag}>")
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{inline(item.group(2))}</li>")
+        elif line == '---':
+            out.append("<hr>")
+        elif line.startswith('#'):
+            level = min(len(line) - len(line.lstrip('#')), 6)
+            out.append(f"<h{level}>{inline(line[level:].strip())}</h{level}>")
+        elif line:
+            paragraph.append(inline(line))
+    return '\n'.join(out)
+
+
+def _items_html(items):
+    out = []
+    for item in items:
+        if item['type'] == 'markdown':
+            out.append(_markdown_html(item['body']))
+        elif item['type'] == 'alert':
+            out.append(f"<div class=\"alert {item['kind']}\">{_markdown_html(item['body'])}</div>")
+        elif item['type'] == 'metric':
+            delta = f"<div class=\"delta\">{html.escape(item['delta'])}</div>" if item['delta'] else ''
+            out.append(f"<div class=\"metric\"><div class=\"label\">{html.escape(item['label'])}</div>"
+                       f"<div class=\"value\">{html.escape(item['value'])}</div>{delta}</div>")
+        elif item['type'] == 'dataframe':
+            data = item['data']
+            table = pd.DataFrame(data['data'], index=data['index'], columns=data['columns'])
+            out.append(table.to_html(border=0, classes='dataframe'))
+        elif item['type'] == 'plotly':
+            out.append(pio.to_html(item['spec'], full_html=False, include_plotlyjs=False, validate=False))
+        elif item['type'] == 'columns':
+            columns = ''.join(f"<div class=\"column\">{_items_html(column)}</div>" for column in item['columns'])
+            out.append(f"<div class=\"columns\">{columns}</div>")
+    return '\n'.join(out)
+
+
+STYLE = """
+body { font-family: sans-serif; max-width: 960px; margin: 2rem auto; padding: 0 1rem; color: #31333f; }
+nav a { margin-right: 1rem; }
+.alert { padding: 0.75rem 1rem; border-radius: 0.5rem; margin: 1rem 0; }
+.info { background: #e8f0fe; } .success { background: #e6f4ea; }
+.warning { background: #fef7e0; } .error { background: #fce8e6; }
+.columns { display: flex; gap: 1rem; } .column { flex: 1; }
+.metric .label { font-size: 0.9rem; } .metric .value { font-size: 2rem; }
+table.dataframe { border-collapse: collapse; } table.dataframe td, table.dataframe th { padding: 0.25rem 0.5rem; }
+"""
+
+
+def _page_html(title, body, report):
+    links = ''.join(f"<a href=\"{_slug(page)}.html\">{html.escape(page)}</a>" for page in report['pages'])
+    period = f" ({report['period'][0]}-{report['period'][1]})" if report['period'] else ''
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)} - UK Property Price Predictor</title>
+<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>
+<style>{STYLE}</style>
+</head>
+<body>
+<nav>{links}</nav>
+<h1>UK Property Price Predictor</h1>
+<p><em>Pre-rendered report, data version {report['version']}{period}</em></p>
+{body}
+</body>
+</html>
+"""
+
+
+# Write report.json (for the app) and one HTML page per report page (for anyone) to static/reports/<version>/
+def build_reports(pages=REPORT_PAGES, out_dir=REPORT_DIR):
+    report = render_report(pages)
+    version_dir = os.path.join(out_dir, report['version'])
+    os.makedirs(version_dir, exist_ok=True)
+
+    with open(os.path.join(version_dir, "report.json"), 'w') as f:
+        json.dump(report, f)
+    for title, items in report['pages'].items():
+        with open(os.path.join(version_dir, f"{_slug(title)}.html"), 'w') as f:
+            f.write(_page_html(title, _items_html(items), report))
+    with open(os.path.join(version_dir, "index.html"), 'w') as f:
+        f.write(_page_html(pages[0], _items_html(report['pages'][pages[0]]), report))
+    return version_dir
+
+
+# ---- Serving in the app ----
+
+@st.cache_data
+def load_report(version):
+    try:
+        with open(os.path.join(REPORT_DIR, version, "report.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _show_items(items):
+    for item in items:
+        if item['type'] == 'markdown':
+            st.markdown(item['body'])
+        elif item['type'] == 'alert':
+            getattr(st, item['kind'])(item['body'])
+        elif item['type'] == 'metric':
+            st.metric(item['label'], item['value'], item['delta'])
+        elif item['type'] == 'dataframe':
+            data = item['data']
+            st.dataframe(pd.DataFrame(data['data'], index=data['index'], columns=data['columns']))
+        elif item['type'] == 'plotly':
+            st.plotly_chart(item['spec'])
+        elif item['type'] == 'columns':
+            for column, column_items in zip(st.columns(len(item['columns'])), item['columns']):
+                with column:
+                    _show_items(column_items)
+
+
+# Show the pre-rendered version of a page if there is one for this dataset and the visitor
+# hasn't moved the period slider away from the default. Returns False to render the page live.
+def show_static_report(title):
+    if _building:
+        return False
+    report = load_report(report_version())
+    if report is None or title not in report['pages']:
+        return False
+
+    period = report['period']
+    if period is not None:
+        if list(st.session_state.get('period', period)) != period:
+            return False
+        # Keep the slider so visitors can still pick other years (which renders live)
+        data_manager.period_selector()
+
+    _show_items(report['pages'][title])
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render the read-only pages into static/reports/<version>/")
+    parser.add_argument("--pages", nargs="+", choices=REPORT_PAGES, default=REPORT_PAGES)
+    args = parser.parse_args()
+
+    version_dir = build_reports(args.pages)
+    print(f"Reports written to: {version_dir}")
+    print(f"With static serving on, open /app/static/reports/{os.path.basename(version_dir)}/index.html")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.linear_model import SGDRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from src.feature_engineering import MIN_PRICE, MAX_PRICE, engineer_features
+from src.model_registry import build_models, model_features
+from src.zip_reader import RAW_ZIP
+
+RAW_COLUMNS = ['Transaction unique identifier', 'Price', 'Date of Transfer', 'Property Type',
+               'Old/New', 'Duration', 'Town/City', 'District', 'County']
+
+# Rows read from disk at a time - memory stays roughly constant whatever the file size
+CHUNK_SIZE = 500000
+
+# Size of the hashed feature space; big enough that few locations share a slot
+N_HASHED_FEATURES = 2 ** 20
+
+# One in ten transactions (picked by hashing the transaction id) is kept back for testing
+HOLDOUT_BUCKETS = 10
+
+# Sample sizes kept in memory for comparing against the normal in-memory models
+SAMPLE_SIZE = 20000
+MAX_HOLDOUT_SAMPLE = 200000
+
+
+# Turn each sale into tokens like "county=SURREY" which the hasher maps to sparse columns.
+# A few crossed tokens let the linear model price a flat in Surrey differently from a flat in Leeds.
+def make_tokens(chunk):
+    year = chunk['Date of Transfer'].str[:4]
+    district = chunk['County'] + '|' + chunk['District']
+    columns = [
+        'type=' + chunk['Property Type'],
+        'new=' + chunk['Old/New'],
+        'tenure=' + chunk['Duration'],
+        'year=' + year,
+        'county=' + chunk['County'],
+        'district=' + district,
+        'town=' + district + '|' + chunk['Town/City'],
+        'type_county=' + chunk['Property Type'] + '|' + chunk['County'],
+        'type_year=' + chunk['Property Type'] + '|' + year,
+    ]
+    return zip(*[column.to_numpy() for column in columns])
+
+
+def make_hasher():
+    return FeatureHasher(n_features=N_HASHED_FEATURES, input_type='string', alternate_sign=False)
+
+
+# Read the file in chunks, dropping the same price outliers as the in-memory models
+def iter_chunks(csv_path, chunk_size=CHUNK_SIZE):
+    for chunk in pd.read_csv(csv_path, usecols=RAW_COLUMNS, chunksize=chunk_size):
+        chunk = chunk.dropna()
+        chunk = chunk[(chunk['Price'] > MIN_PRICE) & (chunk['Price'] < MAX_PRICE)]
+        is_holdout = (
+            pd.util.hash_pandas_object(chunk['Transaction unique identifier'], index=False)
+            % HOLDOUT_BUCKETS == 0
+        ).to_numpy()
+        yield chunk[~is_holdout], chunk[is_holdout]
+
+
+# Keep a fixed-size uniform random sample of everything seen so far
+def update_reservoir(reservoir, chunk, size, rng):
+    chunk = chunk.assign(_key=rng.random(len(chunk)))
+    if reservoir is not None:
+        chunk = pd.concat([reservoir, chunk])
+    return chunk.nsmallest(size, '_key')
+
+
+# Running totals so R² and MAE can be worked out without keeping every prediction
+class StreamingScore:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_squared = 0.0
+        self.squared_error = 0.0
+        self.absolute_error = 0.0
+
+    def update(self, y, predictions):
+        self.count += len(y)
+        self.total += y.sum()
+        self.total_squared += (y ** 2).sum()
+        self.squared_error += ((y - predictions) ** 2).sum()
+        self.absolute_error += np.abs(y - predictions).sum()
+
+    def result(self):
+        variance = self.total_squared - self.total ** 2 / self.count
+        return {'rows': self.count,
+                'test_r2': 1 - self.squared_error / variance,
+                'test_mae': self.absolute_error / self.count}
+
+
+# Fit a linear model on hashed features one chunk at a time.
+# Prices are modelled on a log scale so a £50k error on a £100k flat counts more than on a £900k house.
+def train_streaming(csv_path, epochs=1, chunk_size=CHUNK_SIZE, seed=42):
+    rng = np.random.default_rng(seed)
+    hasher = make_hasher()
+    model = SGDRegressor(alpha=1e-7, learning_rate='invscaling', eta0=0.02, random_state=seed)
+    sample, holdout_sample = None, None
+    rows_trained = 0
+
+    for epoch in range(epochs):
+        for train_chunk, holdout_chunk in iter_chunks(csv_path, chunk_size):
+            X = hasher.transform(make_tokens(train_chunk))
+            model.partial_fit(X, np.log(train_chunk['Price'].to_numpy()))
+            rows_trained += len(train_chunk)
+
+            # Samples for the in-memory comparison are only collected on the first pass
+            if epoch == 0:
+                sample = update_reservoir(sample, train_chunk, SAMPLE_SIZE, rng)
+                holdout_sample = update_reservoir(holdout_sample, holdout_chunk, MAX_HOLDOUT_SAMPLE, rng)
+            print(f"Epoch {epoch + 1}: trained on {rows_trained:,} rows")
+
+    # Score on every held-back row with one more pass over the file
+    score = StreamingScore()
+    for _, holdout_chunk in iter_chunks(csv_path, chunk_size):
+        predictions = np.exp(model.predict(hasher.transform(make_tokens(holdout_chunk))))
+        score.update(holdout_chunk['Price'].to_numpy(), predictions)
+
+    return model, score.result(), sample.drop(columns='_key'), holdout_sample.drop(columns='_key')
+
+
+# Engineered features for the sample and the held-back rows. Category codes are shared so both
+# frames mean the same thing, but price tiers and rarity come from the sample only.
+def sample_features(sample, holdout_sample):
+    combined = engineer_features(pd.concat([sample, holdout_sample], keys=['sample', 'holdout']),
+                                 reference=sample)
+    return combined.loc['sample'], combined.loc['holdout']
+
+
+# Train every registry model on the 20k sample and score them and the streaming model on the same held-back rows
+def compare_with_sample_models(model, sample, holdout_sample):
+    hasher = make_hasher()
+    streamed_predictions = np.exp(model.predict(hasher.transform(make_tokens(holdout_sample))))
+
+    train, holdout = sample_features(sample, holdout_sample)
+
+    y = holdout_sample['Price'].to_numpy()
+    comparison = {
+        'holdout_rows': len(y),
+        'streaming_model': {'test_r2': r2_score(y, streamed_predictions),
+                            'test_mae': mean_absolute_error(y, streamed_predictions)},
+    }
+    for name, sample_model in build_models().items():
+        sample_model.fit(train[model_features(name)], train['Price'])
+        predictions = sample_model.predict(holdout[model_features(name)])
+        comparison[f'{SAMPLE_SIZE // 1000}k_sample_{name}'] = {
+            'test_r2': r2_score(y, predictions), 'test_mae': mean_absolute_error(y, predictions)}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train on the full Land Registry file in chunks")
+    parser.add_argument("--csv", default=RAW_ZIP, help="Land Registry CSV, or the Kaggle zip it came in")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the file")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--output-dir", default="outputs/models/streaming")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model, full_score, sample, holdout_sample = train_streaming(args.csv, args.epochs, args.chunk_size)
+    comparison = compare_with_sample_models(model, sample, holdout_sample)
+    results = {'full_holdout': full_score, 'comparison': comparison,
+               'epochs': args.epochs, 'seconds': time.perf_counter() - start}
+
+    print(f"Streaming model on all {full_score['rows']:,} held-back rows: "
+          f"R² = {full_score['test_r2']:.3f}, MAE = £{full_score['test_mae']:,.0f}")
+    for name, scores in comparison.items():
+        if name != 'holdout_rows':
+            print(f"  {name}: R² = {scores['test_r2']:.3f}, MAE = £{scores['test_mae']:,.0f}")
+
+    # Save the model the same way notebook 03 does
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(f"{args.output_dir}/streaming_model.pkl", 'wb') as file:
+        pickle.dump(model, file)
+    with open(f"{args.output_dir}/streaming_results.json", 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"Model and results saved to: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
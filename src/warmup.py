@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from functools import partial
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+READY_FILE = os.path.join(ROOT_DIR, "outputs", "warmup", "ready.json")
+
+# Pages that look the same for every visitor - rendering them once fills the caches.
+# ML Performance is left out because it retrains the models on every visit anyway.
+WARM_PAGES = ['Project Summary', 'Property Analysis', 'Project Hypothesis', 'Price Predictor']
+
+# Heroku kills a web dyno that hasn't bound its port 60s after starting, and the port only
+# opens after the warm-up - steps that would start after this many seconds are skipped
+WARM_UP_SECONDS = 40
+
+# Progress of the warm-up in this process
+_status = {'ready': False, 'steps': {}, 'failed': {}, 'skipped': []}
+
+
+# Import the slow libraries up front (sklearn and plotly take seconds on a cold dyno)
+def _import_libraries():
+    import pandas  # noqa: F401
+    import plotly.express  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.model_selection  # noqa: F401
+
+
+def _load_data():
+    from src.data_manager import load_small_dataset, load_geo_index
+
+    if load_small_dataset() is None:
+        raise RuntimeError("Small dataset not found - run the data collection notebook first")
+    load_geo_index()
+
+
+# Open a page headlessly in this process so data caches, resource caches
+# and the first Plotly figures are built before any real visitor arrives
+def _render_page(title):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300).run()
+    pages = at.sidebar.selectbox[0]
+    pages.select_index(pages.options.index(title))
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{title} page failed during warm-up: {at.exception[0].value}")
+
+
+# Pre-render the read-only pages for this dataset unless that version is already built
+def _build_reports():
+    from src.static_reports import REPORT_DIR, build_reports, report_version
+
+    if not os.path.exists(os.path.join(REPORT_DIR, report_version(), "report.json")):
+        build_reports()
+
+
+WARM_UP_STEPS = [
+    ('import libraries', _import_libraries),
+    ('load data', _load_data),
+] + [(f'render {title}', partial(_render_page, title)) for title in WARM_PAGES] + [
+    ('build static reports', _build_reports),
+]
+
+
+# Run every warm-up step once per process and record how long each took.
+# A failing step is logged and skipped rather than stopping the server from starting:
+# the app then works like it did without a warm-up, just slower for the first visitors.
+# The process only counts as ready when every step ran and succeeded.
+def warm_up(budget=WARM_UP_SECONDS):
+    if _status['ready']:
+        return _status
+
+    if os.path.exists(READY_FILE):
+        os.remove(READY_FILE)
+
+    started = time.perf_counter()
+    for name, step in WARM_UP_STEPS:
+        if time.perf_counter() - started > budget:
+            _status['skipped'].append(name)
+            print(f"Warm-up: skipped {name}, over the {budget}s warm-up budget")
+            continue
+
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as error:
+            _status['failed'][name] = f"{type(error).__name__}: {error}"
+            print(f"Warm-up: {name} failed - {_status['failed'][name]}")
+            traceback.print_exc()
+            continue
+        _status['steps'][name] = round(time.perf_counter() - start, 3)
+        print(f"Warm-up: {name} took {_status['steps'][name]:.1f}s")
+
+    if _status['failed'] or _status['skipped']:
+        print("Warm-up incomplete - starting the server anyway, not marked as ready")
+        return _status
+
+    _status['ready'] = True
+
+    # Marker for the readiness check, tied to this process
+    os.makedirs(os.path.dirname(READY_FILE), exist_ok=True)
+    with open(READY_FILE, "w") as f:
+        json.dump({'pid': os.getpid(), 'finished': time.time(), 'steps': _status['steps']}, f, indent=4)
+
+    return _status
+
+
+def is_ready():
+    return _status['ready']
+
+
+# Readiness probe for other processes: healthy only if the warmed server is still running
+def check_ready():
+    try:
+        with open(READY_FILE) as f:
+            pid = json.load(f)['pid']
+        os.kill(pid, 0)
+    except (OSError, ValueError, KeyError):
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm up caches, then start the Streamlit server")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 0 if a warmed-up server is running, 1 otherwise")
+    parser.add_argument("--no-serve", action="store_true",
+                        help="Only run the warm-up, don't start the server")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check_ready() else 1)
+
+    warm_up()
+    if args.no_serve:
+        return
+
+    # Start Streamlit in this same process so it reuses the warm caches.
+    # The port only opens now, so the platform router and /_stcore/health
+    # never see the server before warm-up has finished.
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", APP_PATH]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import csv
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.csv as pv
+
+RAW_ZIP = "inputs/datasets/raw/uk-housing-prices-paid.zip"
+
+# Column types of the Kaggle price_paid_records.csv. Repeated text columns are read as
+# dictionaries (each distinct value stored once), which keeps the full file in memory small.
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+LAND_REGISTRY_SCHEMA = {
+    'Transaction unique identifier': pa.string(),
+    'Price': pa.int64(),
+    'Date of Transfer': pa.timestamp('s'),
+    'Property Type': CATEGORY,
+    'Old/New': CATEGORY,
+    'Duration': CATEGORY,
+    'Town/City': CATEGORY,
+    'District': CATEGORY,
+    'County': CATEGORY,
+    'PPDCategory Type': CATEGORY,
+    'Record Status - monthly file only': CATEGORY,
+}
+
+# Bytes of CSV handed to each parsing thread at a time
+BLOCK_SIZE = 16 * 1024 * 1024
+
+MB = 1024 * 1024
+
+# Bytes of CSV read out of the zip before parsing. Each segment is split into BLOCK_SIZE
+# blocks that are parsed on all cores, so memory stays bounded whatever the file size.
+SEGMENT_SIZE = 64 * MB
+
+
+# Read the decompressed CSV in pieces that end on a line break, so every piece parses on its
+# own. (The Land Registry file has no line breaks inside quoted values.)
+def _segments(csv_file, segment_size):
+    leftover = b''
+    while True:
+        data = csv_file.read(segment_size)
+        if not data:
+            if leftover:
+                yield leftover
+            return
+        data = leftover + data
+        cut = data.rfind(b'\n') + 1
+        leftover = data[cut:]
+        if cut:
+            yield data[:cut]
+
+
+# Reads the CSV inside the Kaggle zip without extracting it. Decompressed bytes are cut into
+# segments and each segment goes to Arrow's multi-threaded CSV reader (pv.open_csv only
+# parses one block at a time). The next segment is decompressed on another thread while
+# the current one is parsed. Iterate over it for typed record batches;
+# bytes_read / mb_per_second show progress.
+class ZipCSVReader:
+    def __init__(self, zip_path=RAW_ZIP, member=None, columns=None, block_size=BLOCK_SIZE,
+                 segment_size=SEGMENT_SIZE):
+        self.zip_path = zip_path
+        self.member = member
+        self.columns = columns
+        self.block_size = block_size
+        self.segment_size = segment_size
+        self.rows = 0
+        self.bytes_read = 0
+        self.seconds = 0.0
+
+    @property
+    def mb_per_second(self):
+        return self.bytes_read / MB / self.seconds if self.seconds else 0.0
+
+    def __iter__(self):
+        with zipfile.ZipFile(self.zip_path) as archive:
+            member = self.member or next(name for name in archive.namelist() if name.endswith('.csv'))
+            with archive.open(member) as csv_file:
+                start = time.perf_counter()
+                header = csv_file.readline()
+                self.bytes_read = len(header)
+                read_options = pv.ReadOptions(use_threads=True, block_size=self.block_size,
+                                              column_names=next(csv.reader([header.decode('utf-8-sig')])))
+                convert_options = pv.ConvertOptions(
+                    column_types=LAND_REGISTRY_SCHEMA,
+                    include_columns=self.columns,
+                    timestamp_parsers=['%Y-%m-%d %H:%M'],
+                )
+
+                segments = _segments(csv_file, self.segment_size)
+                with ThreadPoolExecutor(max_workers=1) as unzip:
+                    next_segment = unzip.submit(next, segments, None)
+                    while (segment := next_segment.result()) is not None:
+                        next_segment = unzip.submit(next, segments, None)
+                        table = pv.read_csv(pa.BufferReader(segment), read_options=read_options,
+                                            convert_options=convert_options)
+                        self.bytes_read += len(segment)
+                        for batch in table.to_batches():
+                            self.rows += batch.num_rows
+                            self.seconds = time.perf_counter() - start
+                            yield batch
+
+
+# The whole file as one pandas DataFrame (what notebook 01 used to get from the extracted CSV)
+def read_zip_csv(zip_path=RAW_ZIP, member=None, columns=None, report=True):
+    reader = ZipCSVReader(zip_path, member, columns)
+    batches = []
+    for batch in reader:
+        batches.append(batch)
+        if report and len(batches) % 20 == 0:
+            print(f"{reader.rows:,} rows, {reader.bytes_read / MB:,.0f} MB at {reader.mb_per_second:.0f} MB/s")
+
+    if report:
+        print(f"Read {reader.rows:,} rows ({reader.bytes_read / MB:,.0f} MB) in {reader.seconds:.1f}s "
+              f"at {reader.mb_per_second:.0f} MB/s")
+    if not batches:
+        raise ValueError(f"No rows found in {zip_path}")
+    return pa.Table.from_batches(batches).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time reading the Land Registry CSV straight from the Kaggle zip")
+    parser.add_argument("--zip", default=RAW_ZIP)
+    parser.add_argument("--block-size-mb", type=int, default=BLOCK_SIZE // MB)
+    parser.add_argument("--segment-size-mb", type=int, default=SEGMENT_SIZE // MB)
+    args = parser.parse_args()
+
+    reader = ZipCSVReader(args.zip, block_size=args.block_size_mb * MB, segment_size=args.segment_size_mb * MB)
+    for _ in reader:
+        pass
+    print(f"{reader.rows:,} rows, {reader.bytes_read / MB:,.0f} MB in {reader.seconds:.1f}s "
+          f"= {reader.mb_per_second:.0f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
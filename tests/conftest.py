@@ -0,0 +1,42 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Small fake Land Registry extract so tests don't need the Kaggle download
+def make_property_data(n=2000, seed=42):
+    rng = np.random.default_rng(seed)
+    places = [
+        ('SURREY', 'GUILDFORD', 'GUILDFORD'),
+        ('SURREY', 'GUILDFORD', 'CRANLEIGH'),
+        ('SURREY', 'WAVERLEY', 'FARNHAM'),
+        ('WEST YORKSHIRE', 'BRADFORD', 'BINGLEY'),
+        ('WEST YORKSHIRE', 'LEEDS', 'LEEDS'),
+        ('SWINDON', 'SWINDON', 'SWINDON'),
+    ]
+    place = rng.integers(0, len(places), n)
+    base_price = np.array([420000, 380000, 450000, 160000, 190000, 210000])
+    property_type = rng.choice(['D', 'S', 'T', 'F', 'O'], n, p=[0.25, 0.3, 0.25, 0.18, 0.02])
+    type_factor = pd.Series(property_type).map({'D': 1.5, 'S': 1.0, 'T': 0.85, 'F': 0.7, 'O': 1.2}).to_numpy()
+    dates = pd.Timestamp('1995-01-01') + pd.to_timedelta(rng.integers(0, 8400, n), unit='D')
+
+    return pd.DataFrame({
+        'Transaction unique identifier': [f"{{{i:08X}-0000-0000-0000-000000000000}}" for i in range(n)],
+        'Price': (base_price[place] * type_factor * rng.lognormal(0, 0.3, n)).round(-2).astype(int),
+        'Date of Transfer': dates.strftime('%Y-%m-%d 00:00'),
+        'Property Type': property_type,
+        'Old/New': rng.choice(['Y', 'N'], n, p=[0.1, 0.9]),
+        'Duration': rng.choice(['F', 'L'], n, p=[0.75, 0.25]),
+        'Town/City': [places[i][2] for i in place],
+        'District': [places[i][1] for i in place],
+        'County': [places[i][0] for i in place],
+        'PPDCategory Type': 'A',
+        'Record Status - monthly file only': 'A',
+    })
+
+
+@pytest.fixture
+def property_df():
+    return make_property_data()
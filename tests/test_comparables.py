@@ -0,0 +1,90 @@
+import pandas as pd
+from src.comparables import build_comparables_index, CELL_COLUMNS
+
+
+def _expected(df, cell):
+    mask = (df[CELL_COLUMNS] == pd.Series(cell, index=CELL_COLUMNS)).all(axis=1)
+    matches = df[mask].copy()
+    matches['date'] = pd.to_datetime(matches['Date of Transfer'])
+    return matches
+
+
+def test_pages_cover_date_range_in_order(property_df):
+    index = build_comparables_index(property_df)
+    cell = ('S', 'SURREY', 'N', 'F')
+    expected = _expected(property_df, cell)
+    expected = expected[(expected['date'] >= '2000-01-01') & (expected['date'] <= '2009-12-31')]
+
+    seen, cursor = [], 0
+    while cursor is not None:
+        rows, cursor = index.page(cell, '2000-01-01', '2009-12-31', sort='Oldest first',
+                                  cursor=cursor, page_size=7)
+        seen.append(rows)
+    seen = pd.concat(seen)
+
+    assert index.count(cell, '2000-01-01', '2009-12-31') == len(expected) == len(seen)
+    assert pd.to_datetime(seen['Date of Transfer']).is_monotonic_increasing
+
+
+def test_newest_first_and_price_sorts(property_df):
+    index = build_comparables_index(property_df)
+    cell = ('D', 'WEST YORKSHIRE', 'N', 'F')
+    expected = _expected(property_df, cell)
+
+    newest, _ = index.page(cell, sort='Newest first', page_size=5)
+    assert pd.to_datetime(newest['Date of Transfer']).iloc[0] == expected['date'].max()
+
+    highest, _ = index.page(cell, sort='Highest price', page_size=5)
+    assert list(highest['Price']) == sorted(expected['Price'], reverse=True)[:5]
+
+
+def test_unknown_cell_is_empty(property_df):
+    index = build_comparables_index(property_df)
+    rows, cursor = index.page(('D', 'NOWHERE', 'N', 'F'))
+
+    assert len(rows) == 0
+    assert cursor is None
+    assert index.date_bounds(('D', 'NOWHERE', 'N', 'F')) == (None, None)
+
+
+def test_price_sorts_stay_inside_date_range(property_df):
+    index = build_comparables_index(property_df)
+    cell = ('S', 'SURREY', 'N', 'F')
+    expected = _expected(property_df, cell)
+    expected = expected[(expected['date'] >= '2000-01-01') & (expected['date'] <= '2009-12-31')]
+
+    seen, cursor = [], 0
+    while cursor is not None:
+        rows, cursor = index.page(cell, '2000-01-01', '2009-12-31', sort='Lowest price',
+                                  cursor=cursor, page_size=7)
+        seen.append(rows)
+    seen = pd.concat(seen)
+
+    assert sorted(seen.index) == sorted(expected.index)
+    assert seen['Price'].is_monotonic_increasing
+
+    highest, _ = index.page(cell, '2000-01-01', '2009-12-31', sort='Highest price', page_size=5)
+    assert list(highest['Price']) == sorted(expected['Price'], reverse=True)[:5]
+
+
+def test_reversed_date_range_is_empty(property_df):
+    index = build_comparables_index(property_df)
+    cell = ('S', 'SURREY', 'N', 'F')
+    rows, cursor = index.page(cell, '2009-12-31', '2000-01-01', sort='Highest price')
+
+    assert index.count(cell, '2009-12-31', '2000-01-01') == 0
+    assert len(rows) == 0 and cursor is None
+
+
+def test_price_order_of_a_date_range_is_sorted_once(property_df):
+    index = build_comparables_index(property_df)
+    cell = ('S', 'SURREY', 'N', 'F')
+
+    cursor, pages = 0, 0
+    while cursor is not None:
+        _, cursor = index.page(cell, '2000-01-01', '2009-12-31', sort='Highest price', cursor=cursor, page_size=5)
+        pages += 1
+    index.page(cell, '2000-01-01', '2009-12-31', sort='Lowest price')
+
+    assert pages > 2
+    assert index._range_price_order.cache_info().misses == 1
@@ -0,0 +1,54 @@
+from src.drift import compare_sketches, load_sketch, sketch_csv
+from conftest import make_property_data
+
+
+def test_same_distribution_is_stable(tmp_path):
+    make_property_data(4000, seed=1).to_csv(tmp_path / "train.csv", index=False)
+    make_property_data(4000, seed=2).to_csv(tmp_path / "new.csv", index=False)
+
+    sketch_csv(tmp_path / "train.csv", chunk_size=1000).save(str(tmp_path / "sketch.json"))
+    report = compare_sketches(load_sketch(str(tmp_path / "sketch.json")),
+                              sketch_csv(tmp_path / "new.csv", chunk_size=700))
+
+    assert report['rows']['training'] > 3900
+    assert all(result['status'] == 'stable' for result in report['features'].values())
+    assert report['flagged_counties'] == []
+
+
+def test_flags_county_prices_and_new_build_share(tmp_path):
+    training = make_property_data(4000, seed=1)
+    new = make_property_data(4000, seed=2)
+    surrey = new['County'] == 'SURREY'
+    new.loc[surrey, 'Price'] = (new.loc[surrey, 'Price'] * 1.5).astype(int)
+    new.loc[new.index[:1500], 'Old/New'] = 'Y'
+
+    training.to_csv(tmp_path / "train.csv", index=False)
+    new.to_csv(tmp_path / "new.csv", index=False)
+    report = compare_sketches(sketch_csv(tmp_path / "train.csv"), sketch_csv(tmp_path / "new.csv"))
+
+    assert report['features']['Old/New']['status'] == 'alert'
+    assert report['features']['Property Type']['status'] == 'stable'
+    assert [county['county'] for county in report['flagged_counties']] == ['SURREY']
+    assert 0.3 < report['flagged_counties'][0]['median_change'] < 0.7
+
+
+def test_sales_outside_price_range_are_tracked(tmp_path):
+    training = make_property_data(4000, seed=1)
+    new = make_property_data(4000, seed=2)
+    # Leeds prices jump past the £1M limit and a fifth of sales elsewhere drop under £50k
+    leeds = new['District'] == 'LEEDS'
+    new.loc[leeds, 'Price'] = 1500000
+    cheap = new.index[~leeds][:800]
+    new.loc[cheap, 'Price'] = 30000
+
+    training.to_csv(tmp_path / "train.csv", index=False)
+    new.to_csv(tmp_path / "new.csv", index=False)
+    report = compare_sketches(sketch_csv(tmp_path / "train.csv"), sketch_csv(tmp_path / "new.csv"))
+
+    price_range = report['features']['Price range']
+    assert price_range['status'] == 'alert'
+    assert 0.15 < price_range['new_shares']['below'] < 0.25
+    assert report['rows']['new'] == len(new)
+
+    flagged = {county['county']: county for county in report['flagged_counties']}
+    assert flagged['WEST YORKSHIRE']['new_out_of_range_share'] > 0.4
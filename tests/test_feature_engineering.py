@@ -0,0 +1,12 @@
+import numpy as np
+from src.feature_engineering import FEATURES, build_feature_matrix, clean_prices, engineer_features
+
+
+def test_feature_matrix_matches_engineered_frame(property_df):
+    X, y, rows = build_feature_matrix(property_df)
+    expected = engineer_features(clean_prices(property_df))
+
+    assert X.dtype == np.float32 and X.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(X, expected[FEATURES].to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(y, expected['Price'].to_numpy())
+    np.testing.assert_array_equal(property_df.index[rows], expected.index)
@@ -0,0 +1,43 @@
+from src.geo_index import build_geo_index
+
+
+def test_estimates_follow_hierarchy(property_df):
+    index = build_geo_index(property_df)
+
+    county = index.estimate('D', 'F', 'SURREY')
+    district = index.estimate('D', 'F', 'SURREY', 'GUILDFORD')
+    town = index.estimate('D', 'F', 'SURREY', 'GUILDFORD', 'CRANLEIGH')
+
+    assert county['level'] == 'County'
+    assert district['level'] == 'District'
+    assert town['level'] == 'Town/City'
+    assert county['count'] >= district['count'] >= town['count'] > 0
+
+
+def test_unknown_place_falls_back_to_parent(property_df):
+    index = build_geo_index(property_df)
+
+    result = index.estimate('S', 'F', 'SURREY', 'NOWHERE')
+    assert result['level'] == 'County'
+    assert result['estimate'] == index.estimate('S', 'F', 'SURREY')['estimate']
+
+
+def test_sparse_cell_is_shrunk_towards_parent(property_df):
+    # One very expensive sale shouldn't become the district estimate
+    df = property_df.copy()
+    df.loc[0, ['County', 'District', 'Town/City', 'Property Type', 'Duration', 'Price']] = [
+        'SURREY', 'TINY', 'TINY', 'D', 'F', 5000000
+    ]
+    index = build_geo_index(df, shrinkage=20)
+
+    parent = index.estimate('D', 'F', 'SURREY')['estimate']
+    result = index.estimate('D', 'F', 'SURREY', 'TINY')
+    assert result['count'] == 1
+    assert parent < result['estimate'] < parent + (5000000 - parent) / 20
+
+
+def test_dropdown_lists(property_df):
+    index = build_geo_index(property_df)
+
+    assert index.districts('SURREY') == ['GUILDFORD', 'WAVERLEY']
+    assert index.towns('SURREY', 'GUILDFORD') == ['CRANLEIGH', 'GUILDFORD']
@@ -0,0 +1,27 @@
+from conftest import make_property_data
+from src.memory_profile import PAGES, budgeted_sizes, load_budgets, over_budget, profile_sizes
+
+# Dataset sizes checked on every test run (bigger sizes: python -m src.memory_profile)
+TEST_SIZES = [1000, 4000]
+
+
+def test_pages_stay_within_memory_budgets():
+    results = profile_sizes(make_property_data(4000), TEST_SIZES)
+
+    for size in TEST_SIZES:
+        assert set(results[size]) == set(PAGES)
+    assert over_budget(results, load_budgets()) == []
+
+
+def test_over_budget_reports_page_and_size():
+    results = {4000: {'ML Performance': {'peak_mb': 50.0, 'sections': {}}}}
+
+    failures = over_budget(results, {'ML Performance': {'4000': 8}})
+    assert failures == ["ML Performance at 4,000 rows: 50.0 MB > 8 MB budget"]
+
+
+def test_every_page_has_a_budget_at_every_budgeted_size():
+    budgets = load_budgets()
+    assert set(budgets) == set(PAGES)
+    for page in PAGES:
+        assert sorted(int(size) for size in budgets[page]) == budgeted_sizes(budgets)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src import data_manager
+from src.partitions import (file_sha256, load_stats, read_date_range, write_partitions,
+                            write_partitions_from_csv)
+
+
+def test_partitions_and_date_range(property_df, tmp_path):
+    # Write in several chunks so partitions are appended to
+    chunks = [property_df.iloc[i:i + 500] for i in range(0, len(property_df), 500)]
+    stats = write_partitions(chunks, tmp_path)
+
+    dates = pd.to_datetime(property_df['Date of Transfer'])
+    assert sum(s['rows'] for s in stats.values()) == len(property_df)
+    assert load_stats(tmp_path) == stats
+    assert stats['2001']['rows'] == (dates.dt.year == 2001).sum()
+
+    result = read_date_range('2001-06-15', '2003-02-01', out_dir=tmp_path)
+    expected = dates.between('2001-06-15', '2003-02-01').sum()
+    assert len(result) == expected
+    assert result['Date of Transfer'].min() >= pd.Timestamp('2001-06-15')
+    assert result['Date of Transfer'].max() <= pd.Timestamp('2003-02-01')
+
+
+def test_date_range_outside_data_is_empty(property_df, tmp_path):
+    write_partitions([property_df], tmp_path)
+
+    result = read_date_range('2030-01-01', '2031-01-01', columns=['Price'], out_dir=tmp_path)
+    assert len(result) == 0
+    assert list(result.columns) == ['Price']
+
+
+def test_chunks_with_an_empty_column_share_one_schema(property_df, tmp_path):
+    # The second chunk's status column is all missing, so pandas reads it as float
+    first, second = property_df.iloc[:1000].copy(), property_df.iloc[1000:].copy()
+    second['Record Status - monthly file only'] = np.nan
+    write_partitions([first, second], tmp_path)
+
+    result = read_date_range(out_dir=tmp_path)
+    assert len(result) == len(property_df)
+    assert result['Record Status - monthly file only'].isna().sum() == len(second)
+
+
+def test_stats_only_match_the_dataset_they_were_built_from(property_df, tmp_path):
+    csv_path = tmp_path / "dataset.csv"
+    property_df.to_csv(csv_path, index=False)
+    stats = write_partitions_from_csv(csv_path, tmp_path / "partitions", chunksize=700)
+
+    assert load_stats(tmp_path / "partitions", file_sha256(csv_path)) == stats
+
+    property_df.iloc[:100].to_csv(csv_path, index=False)
+    assert load_stats(tmp_path / "partitions", file_sha256(csv_path)) is None
+    assert load_stats(tmp_path / "partitions") == stats
+
+
+def test_period_falls_back_to_changed_dataset(property_df, tmp_path, monkeypatch):
+    csv_path = tmp_path / "dataset.csv"
+    property_df.to_csv(csv_path, index=False)
+    write_partitions_from_csv(csv_path, tmp_path / "partitions")
+    monkeypatch.setattr(data_manager, 'SMALL_DATASET_PATH', str(csv_path))
+    monkeypatch.setattr(data_manager, 'PERIOD_PARTITION_DIR', str(tmp_path / "partitions"))
+
+    # Only sales up to 1999 in the new version of the dataset
+    dates = pd.to_datetime(property_df['Date of Transfer'])
+    property_df[dates.dt.year < 2000].to_csv(csv_path, index=False)
+    st.cache_data.clear()
+
+    assert data_manager.load_available_years() == [1995, 1996, 1997, 1998, 1999]
+    assert len(data_manager.load_period(1995, 2020)) == (dates.dt.year < 2000).sum()
+    st.cache_data.clear()
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from src import pipeline
+from src.pipeline import Stage, run_pipeline
+
+
+# Stub stage: every output gets the stage's inputs joined together
+def join_inputs(inputs, outputs):
+    text = ''.join(open(path).read() for path in inputs)
+    for path in outputs:
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+# raw -> a -> b, and raw -> c
+def stub_stages(version='v1'):
+    return [
+        Stage('a', join_inputs, ['raw.txt'], [f'out/{version}/a.txt'], ['code_a.py']),
+        Stage('b', join_inputs, [f'out/{version}/a.txt'], [f'out/{version}/b.txt'], ['code_b.py']),
+        Stage('c', join_inputs, ['raw.txt'], [f'out/{version}/c.txt'], ['code_b.py']),
+    ]
+
+
+def append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pipeline, 'build_stages', stub_stages)
+    for path in ['raw.txt', 'code_a.py', 'code_b.py']:
+        append(path, f'{path}\n')
+    return tmp_path
+
+
+def run(**kwargs):
+    return run_pipeline(jobs=1, **kwargs)
+
+
+def test_skips_stages_when_nothing_changed(workspace):
+    assert run() == {'a': 'ran', 'b': 'ran', 'c': 'ran'}
+    assert run() == {'a': 'up to date', 'b': 'up to date', 'c': 'up to date'}
+
+
+def test_reruns_when_input_code_or_output_changes(workspace):
+    run()
+
+    append('code_b.py', '# edited\n')
+    assert run() == {'a': 'up to date', 'b': 'ran', 'c': 'ran'}
+
+    append('out/v1/c.txt', 'edited by hand\n')
+    assert run() == {'a': 'up to date', 'b': 'up to date', 'c': 'ran'}
+    assert open('out/v1/c.txt').read() == 'raw.txt\n'
+
+    # a's output changes, so b reruns as well
+    append('raw.txt', 'new sales\n')
+    assert run() == {'a': 'ran', 'b': 'ran', 'c': 'ran'}
+    assert open('out/v1/b.txt').read() == 'raw.txt\nnew sales\n'
+
+
+def test_missing_source_input_keeps_existing_outputs(workspace, capsys):
+    run()
+    os.remove('raw.txt')
+    capsys.readouterr()
+
+    assert run() == {'a': 'up to date', 'b': 'up to date', 'c': 'up to date'}
+    assert capsys.readouterr().out.count('not found, keeping existing outputs') == 2
+    # Each stage is only checked once in a dry run too
+    assert run(dry_run=True) == {'a': 'up to date', 'b': 'up to date', 'c': 'up to date'}
+    assert capsys.readouterr().out.count('not found, keeping existing outputs') == 2
+
+    os.remove('out/v1/c.txt')
+    with pytest.raises(FileNotFoundError):
+        run()
+
+
+def test_targets_run_with_their_upstream_stages(workspace):
+    assert run(targets=['b']) == {'a': 'ran', 'b': 'ran'}
+    assert not os.path.exists('out/v1/c.txt')
+    assert run(targets=['c']) == {'c': 'ran'}
+
+
+def test_dry_run_follows_stale_stages_downstream(workspace, capsys):
+    # Nothing exists yet, so b's input is missing - it would still run after a
+    assert run(dry_run=True) == {'a': 'would run', 'b': 'would run', 'c': 'would run'}
+    assert not os.path.exists('out')
+
+    run()
+    append('code_a.py', '# edited\n')
+    capsys.readouterr()
+
+    assert run(dry_run=True) == {'a': 'would run', 'b': 'would run', 'c': 'up to date'}
+    assert capsys.readouterr().out.count('[c] up to date') == 1
+    assert run() == {'a': 'ran', 'b': 'up to date', 'c': 'up to date'}
@@ -0,0 +1,31 @@
+import json
+import os
+
+from conftest import make_property_data
+from src.memory_profile import use_dataset
+from src.static_reports import REPORT_PAGES, _markdown_html, build_reports
+
+
+def test_markdown_to_html():
+    body = "**Results:**\n- Detached: £417,200\n- Flats: *cheapest*\n---\n#### Next"
+    assert _markdown_html(body) == (
+        "<p><strong>Results:</strong></p>\n<ul>\n<li>Detached: £417,200</li>\n"
+        "<li>Flats: <em>cheapest</em></li>\n</ul>\n<hr>\n<h4>Next</h4>"
+    )
+
+
+def test_build_writes_versioned_bundle(tmp_path):
+    with use_dataset(make_property_data(1000)):
+        version_dir = build_reports(out_dir=str(tmp_path))
+
+    with open(os.path.join(version_dir, "report.json")) as f:
+        report = json.load(f)
+    assert os.path.basename(version_dir) == report['version']
+    assert list(report['pages']) == REPORT_PAGES
+    assert report['period'] == [1995, 2017]
+
+    # Property Analysis has its charts and county table, ready to replay or serve as HTML
+    types = [item['type'] for item in report['pages']['Property Analysis']]
+    assert types.count('plotly') == 4 and 'dataframe' in types
+    for title in REPORT_PAGES + ['index']:
+        assert os.path.exists(os.path.join(version_dir, f"{title.lower().replace(' ', '-')}.html"))
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from src.model_registry import MODEL_REGISTRY
+from src.feature_engineering import FEATURES
+from src.streaming_training import (StreamingScore, compare_with_sample_models, iter_chunks,
+                                    sample_features, train_streaming, update_reservoir)
+
+
+def test_streaming_score_matches_sklearn():
+    rng = np.random.default_rng(0)
+    y = rng.lognormal(12, 0.5, 1000)
+    predictions = y * rng.normal(1, 0.2, 1000)
+
+    score = StreamingScore()
+    for start in range(0, 1000, 300):
+        score.update(y[start:start + 300], predictions[start:start + 300])
+
+    result = score.result()
+    assert result['rows'] == 1000
+    assert np.isclose(result['test_r2'], r2_score(y, predictions))
+    assert np.isclose(result['test_mae'], mean_absolute_error(y, predictions))
+
+
+def test_holdout_split_is_the_same_for_any_chunk_size(tmp_path, property_df):
+    csv_path = tmp_path / "prices.csv"
+    property_df.to_csv(csv_path, index=False)
+
+    def holdout_ids(chunk_size):
+        ids = [holdout['Transaction unique identifier'] for _, holdout in iter_chunks(csv_path, chunk_size)]
+        return set(pd.concat(ids))
+
+    train = pd.concat(train for train, _ in iter_chunks(csv_path, 250))
+    assert holdout_ids(250) == holdout_ids(1000)
+    assert 0.05 < len(holdout_ids(250)) / len(property_df) < 0.15
+    assert not set(train['Transaction unique identifier']) & holdout_ids(250)
+    assert train['Price'].between(50000, 1000000, inclusive='neither').all()
+
+
+def test_reservoir_keeps_a_fixed_size_sample(property_df):
+    rng = np.random.default_rng(0)
+    reservoir = None
+    for start in range(0, len(property_df), 300):
+        reservoir = update_reservoir(reservoir, property_df.iloc[start:start + 300], 100, rng)
+
+    assert len(reservoir) == 100
+    assert reservoir.index.is_unique and reservoir.index.isin(property_df.index).all()
+    # Rows from late chunks get in as well as early ones
+    assert reservoir.index.max() > len(property_df) / 2 > reservoir.index.min()
+
+
+def test_compares_against_every_sample_model(tmp_path, property_df):
+    csv_path = tmp_path / "prices.csv"
+    property_df.to_csv(csv_path, index=False)
+
+    model, full_score, sample, holdout_sample = train_streaming(csv_path, chunk_size=500)
+    comparison = compare_with_sample_models(model, sample, holdout_sample)
+
+    assert full_score['rows'] == comparison['holdout_rows'] == len(holdout_sample)
+    assert set(comparison) == {'holdout_rows', 'streaming_model'} | {f'20k_sample_{name}' for name in MODEL_REGISTRY}
+
+
+def test_holdout_prices_dont_change_sample_features(property_df):
+    sample, holdout = property_df.iloc[:1500], property_df.iloc[1500:]
+    train_features, holdout_features = sample_features(sample, holdout)
+
+    # Wildly different held-back prices give exactly the same features on both sides
+    changed = holdout.assign(Price=holdout['Price'] * 5)
+    changed_train, changed_holdout = sample_features(sample, changed)
+    pd.testing.assert_frame_equal(train_features[FEATURES], changed_train[FEATURES])
+    pd.testing.assert_frame_equal(holdout_features[FEATURES], changed_holdout[FEATURES])
@@ -0,0 +1,71 @@
+from itertools import combinations
+from math import factorial
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from src.feature_engineering import FEATURES, clean_prices, engineer_features
+from src.tree_attribution import MAX_FEATURES, tree_attributions, cell_attributions
+
+
+def _training_data(property_df):
+    df = engineer_features(clean_prices(property_df))
+    return df[FEATURES], df['Price']
+
+
+# Expected prediction when only the features in `known` are fixed to x (TreeSHAP's definition)
+def _conditional_value(tree, x, known, node=0):
+    if tree.children_left[node] == -1:
+        return tree.value[node, 0, 0]
+    left, right = tree.children_left[node], tree.children_right[node]
+    feature = tree.feature[node]
+    if feature in known:
+        child = left if np.float32(x[feature]) <= tree.threshold[node] else right
+        return _conditional_value(tree, x, known, child)
+    cover = tree.weighted_n_node_samples
+    return (cover[left] * _conditional_value(tree, x, known, left)
+            + cover[right] * _conditional_value(tree, x, known, right)) / cover[node]
+
+
+def _brute_force_shapley(tree, x):
+    n = len(x)
+    phi = np.zeros(n)
+    for i in range(n):
+        others = [j for j in range(n) if j != i]
+        for size in range(n):
+            weight = factorial(size) * factorial(n - size - 1) / factorial(n)
+            for subset in combinations(others, size):
+                phi[i] += weight * (_conditional_value(tree, x, set(subset) | {i})
+                                    - _conditional_value(tree, x, set(subset)))
+    return phi
+
+
+def test_matches_brute_force_shapley(property_df):
+    X, y = _training_data(property_df)
+    model = DecisionTreeRegressor(max_depth=5, random_state=42).fit(X, y)
+    rows = X.to_numpy()[:5]
+
+    values, expected_value = tree_attributions(model, rows)
+    for row, row_values in zip(rows, values):
+        np.testing.assert_allclose(row_values, _brute_force_shapley(model.tree_, row), rtol=1e-6, atol=1e-6)
+    assert np.isclose(expected_value, _conditional_value(model.tree_, rows[0], set()))
+
+
+def test_forest_attributions_add_up_to_prediction(property_df):
+    X, y = _training_data(property_df)
+    model = RandomForestRegressor(n_estimators=10, max_depth=10, random_state=42).fit(X, y)
+
+    values, expected_value = cell_attributions(model, X)
+    assert values.shape == X.shape
+    np.testing.assert_allclose(values.sum(axis=1) + expected_value, model.predict(X), rtol=1e-6)
+
+
+def test_too_many_features_is_refused():
+    rng = np.random.default_rng(0)
+    X = rng.random((50, MAX_FEATURES + 1))
+    model = DecisionTreeRegressor(max_depth=3).fit(X, rng.random(50))
+
+    with pytest.raises(ValueError):
+        tree_attributions(model, X)
@@ -0,0 +1,37 @@
+import pytest
+
+from src import warmup
+
+
+def fail():
+    raise ValueError("element type not supported")
+
+
+@pytest.fixture
+def fresh_status(tmp_path, monkeypatch):
+    monkeypatch.setattr(warmup, 'READY_FILE', str(tmp_path / "ready.json"))
+    monkeypatch.setattr(warmup, '_status', {'ready': False, 'steps': {}, 'failed': {}, 'skipped': []})
+
+
+def test_failing_step_is_logged_and_others_still_run(fresh_status, monkeypatch, tmp_path):
+    ran = []
+    monkeypatch.setattr(warmup, 'WARM_UP_STEPS', [('load data', fail), ('render', lambda: ran.append(1))])
+
+    status = warmup.warm_up()
+    assert ran == [1]
+    assert 'ValueError' in status['failed']['load data']
+    assert not warmup.is_ready() and not (tmp_path / "ready.json").exists()
+
+
+def test_steps_over_budget_are_skipped(fresh_status, monkeypatch):
+    monkeypatch.setattr(warmup, 'WARM_UP_STEPS', [('first', lambda: None), ('second', lambda: None)])
+
+    assert warmup.warm_up(budget=-1)['skipped'] == ['first', 'second']
+    assert not warmup.is_ready()
+
+
+def test_ready_when_every_step_succeeds(fresh_status, monkeypatch, tmp_path):
+    monkeypatch.setattr(warmup, 'WARM_UP_STEPS', [('first', lambda: None)])
+
+    assert warmup.warm_up()['ready']
+    assert (tmp_path / "ready.json").exists()
@@ -0,0 +1,36 @@
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+from src.zip_reader import ZipCSVReader, read_zip_csv
+
+
+def test_reads_typed_columns_from_zip(tmp_path, property_df):
+    zip_path = tmp_path / "uk-housing-prices-paid.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("price_paid_records.csv", property_df.to_csv(index=False))
+
+    df = read_zip_csv(zip_path, report=False)
+    assert df['Price'].tolist() == property_df['Price'].tolist()
+    assert (df['Date of Transfer'] == pd.to_datetime(property_df['Date of Transfer'])).all()
+    assert df['County'].dtype == 'category'
+
+    # Small blocks give several batches, and only the requested columns
+    reader = ZipCSVReader(zip_path, columns=['Price', 'County'], block_size=16 * 1024)
+    batches = list(reader)
+    assert len(batches) > 1 and batches[0].schema.names == ['Price', 'County']
+    assert reader.rows == len(property_df) and reader.mb_per_second > 0
+
+
+def test_segments_split_on_line_breaks(tmp_path, property_df):
+    zip_path = tmp_path / "uk-housing-prices-paid.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("price_paid_records.csv", property_df.to_csv(index=False))
+
+    # Segments much smaller than the file, so lines are cut at segment edges
+    reader = ZipCSVReader(zip_path, block_size=4 * 1024, segment_size=10000)
+    df = pa.Table.from_batches(list(reader)).to_pandas()
+
+    assert reader.bytes_read == len(property_df.to_csv(index=False).encode())
+    assert df['Transaction unique identifier'].tolist() == property_df['Transaction unique identifier'].tolist()
+    assert df['County'].astype(str).tolist() == property_df['County'].tolist()